@@ -0,0 +1,157 @@
+"""端到端抓取基准：启动本地模拟站点（benchmarks/mock_site.py），按各入口脚本的 Profile 完整抓取一遍。
+
+每个场景在独立子进程和临时目录中冷启动运行（没有抓取状态、页面缓存和图片库），
+输出页面/秒、图片/秒、MB/秒、CPU 时间和峰值内存。模拟站点在另一个进程中运行，不计入 CPU。
+
+    python benchmarks/crawl_bench.py                          # 所有场景
+    python benchmarks/crawl_bench.py category multi --list-pages 5 --image-size 800x1200
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+from crawler import Crawler, MultiCrawler  # noqa: E402
+from mock_site import CATEGORIES, serve  # noqa: E402
+
+# 场景 -> 对应的入口脚本
+SCENARIOS = {
+    'category': '秀人集全站下载.py（单个分类）',
+    'multi': '秀人集全站下载.py（多个分类同时抓取）',
+    'new': '秀人集NEW100.py',
+    'hot': '秀人集HOT100.py',
+    'repair': '修复metadata.py（重新抓取模式）',
+    'single': '单章写真.py',
+}
+
+
+# 加载入口脚本（文件名不是合法的模块名），只执行模块顶层，不运行 main()
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(os.path.splitext(filename)[0],
+                                                  os.path.join(os.path.dirname(BENCH_DIR), filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# 按场景构建抓取器，Profile 由入口脚本自己的 make_profile 构建，只把站点地址换成模拟站点
+def build_crawler(scenario, base_url):
+    if scenario == 'category':
+        return Crawler(load_script('秀人集全站下载.py').make_profiles(base_url, ['MiiTao'])[0])
+    if scenario == 'multi':
+        categories = [category for category in CATEGORIES if category != 'XiuRen']
+        return MultiCrawler(load_script('秀人集全站下载.py').make_profiles(base_url, categories))
+    if scenario == 'new':
+        return Crawler(load_script('秀人集NEW100.py').make_profile(base_url=base_url))
+    if scenario == 'hot':
+        return Crawler(load_script('秀人集HOT100.py').make_profile(base_url=base_url))
+    if scenario == 'repair':
+        return Crawler(load_script('修复metadata.py').make_profile(base_url=base_url))
+    if scenario == 'single':
+        return Crawler(load_script('单章写真.py').make_profile(['/MiiTao/103020.html', '/FeiLin/203020.html'],
+                                                              base_url=base_url))
+    raise ValueError(f'未知场景: {scenario}')
+
+
+def counter_total(metrics, name, **labels):
+    return sum(value for (key, key_labels), value in metrics.counters.items()
+               if key == name and all(item in key_labels for item in labels.items()))
+
+
+# 子进程：运行一个场景，输出一行 JSON 结果
+def run_child(scenario, base_url):
+    crawler = build_crawler(scenario, base_url)
+    start = time.perf_counter()
+    asyncio.run(crawler.run())
+    elapsed = time.perf_counter() - start
+
+    metrics = (next(iter(crawler.crawlers.values())) if isinstance(crawler, MultiCrawler) else crawler).metrics
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)  # transcode_mode='process' 的进程池
+    print(json.dumps({
+        'elapsed': elapsed,
+        'pages': counter_total(metrics, 'pages_total', result='fetched'),
+        'images': counter_total(metrics, 'images_total', result='downloaded'),
+        'failed': counter_total(metrics, 'images_total', result='failed'),
+        'bytes': counter_total(metrics, 'image_bytes_total') + counter_total(metrics, 'page_bytes_total'),
+        'cpu': self_usage.ru_utime + self_usage.ru_stime + children_usage.ru_utime + children_usage.ru_stime,
+        'peak_rss': max(self_usage.ru_maxrss, children_usage.ru_maxrss) * 1024,  # Linux 上单位为 KB
+    }))
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    sys.exit(f'模拟站点未能在 {timeout} 秒内启动')
+
+
+def run_scenario(scenario, base_url):
+    with tempfile.TemporaryDirectory() as work_dir:
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', scenario, '--base-url', base_url],
+                                cwd=work_dir, capture_output=True, text=True)
+    if output.returncode != 0:
+        print(output.stderr)
+        return None
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS), help=f'场景: {", ".join(SCENARIOS)}')
+    arg_parser.add_argument('--port', type=int, default=8766)
+    arg_parser.add_argument('--list-pages', type=int, default=1, help='每个分类的列表页数')
+    arg_parser.add_argument('--articles-per-page', type=int, default=20)
+    arg_parser.add_argument('--pages-per-article', type=int, default=4)
+    arg_parser.add_argument('--images-per-page', type=int, default=4)
+    arg_parser.add_argument('--image-size', default='1200x1800', help='图片尺寸，宽x高')
+    arg_parser.add_argument('--child', help=argparse.SUPPRESS)
+    arg_parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.base_url)
+        return
+
+    width, height = map(int, args.image_size.split('x'))
+    server = multiprocessing.Process(target=serve, args=(args.port,), kwargs={
+        'list_pages': args.list_pages, 'articles_per_page': args.articles_per_page,
+        'pages_per_article': args.pages_per_article, 'images_per_page': args.images_per_page,
+        'image_size': (width, height),
+    }, daemon=True)
+    server.start()
+    try:
+        wait_for_port(args.port)
+        base_url = f'http://127.0.0.1:{args.port}'
+        print(f'{"场景":10s} {"耗时(s)":>8s} {"页面/s":>8s} {"图片/s":>8s} {"MB/s":>8s} {"CPU(s)":>8s} {"CPU%":>6s} {"峰值内存(MB)":>12s}  失败')
+        for scenario in args.scenarios:
+            result = run_scenario(scenario, base_url)
+            if result is None:
+                print(f'{scenario:10s} 运行失败')
+                continue
+            elapsed = result['elapsed']
+            print(f'{scenario:10s} {elapsed:8.2f} {result["pages"] / elapsed:8.1f} {result["images"] / elapsed:8.1f} '
+                  f'{result["bytes"] / elapsed / 1024 / 1024:8.1f} {result["cpu"]:8.2f} {result["cpu"] / elapsed * 100:6.0f} '
+                  f'{result["peak_rss"] / 1024 / 1024:12.1f}  {result["failed"]}')
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == '__main__':
+    main()
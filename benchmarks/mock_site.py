@@ -0,0 +1,139 @@
+"""本地模拟站点：按真实站点的结构生成列表页、文章分页和 WebP 图片，供端到端基准测试使用。
+
+    python benchmarks/mock_site.py --port 8765          # 单独启动，便于手动调试
+
+页面结构与 benchmarks/pages 中保存的页面一致：分类 indexN.html 列表页（update_area_lists）、
+文章 N.html / N_k.html 分页（div.page）、new.html / hot.html，以及 /uploadfile/ 下的 WebP 图片。
+"""
+import argparse
+import io
+import random
+import zlib
+
+from aiohttp import web
+from PIL import Image
+
+CATEGORIES = {
+    'MiiTao': 'MiiTao蜜桃社',
+    'FeiLin': 'FeiLin嗲囡囡',
+    'MFStar': 'MFStar模范学院',
+    'MyGirl': 'MyGirl美媛馆',
+    'IMiss': 'IMiss爱蜜社',
+    'XiuRen': 'XiuRen秀人网',
+}
+
+
+class MockSite:
+    """生成模拟站点。文章 ID 按分类和列表页确定，多次请求返回相同内容。"""
+
+    def __init__(self, list_pages=3, articles_per_page=20, pages_per_article=4, images_per_page=4,
+                 image_size=(1200, 1800), image_variants=8, image_quality=80):
+        self.list_pages = list_pages
+        self.articles_per_page = articles_per_page
+        self.pages_per_article = pages_per_article
+        self.images_per_page = images_per_page
+        # 预先生成几张不同内容的图片轮流返回，大小接近真实写真（几百 KB）
+        self.images = [self.make_image(image_size, image_quality, seed) for seed in range(image_variants)]
+
+    @staticmethod
+    def make_image(size, quality, seed):
+        random.seed(seed)
+        base = Image.new('RGB', size, tuple(random.randrange(256) for _ in range(3)))
+        noise = Image.effect_noise(size, 40).convert('RGB')
+        buffer = io.BytesIO()
+        Image.blend(base, noise, 0.5).save(buffer, 'WEBP', quality=quality)
+        return buffer.getvalue()
+
+    def article_id(self, category, list_page, position):
+        category_index = list(CATEGORIES).index(category)
+        return (category_index + 1) * 100000 + (self.list_pages - list_page + 1) * 1000 + (self.articles_per_page - position)
+
+    def article_category(self, article_id):
+        return list(CATEGORIES)[article_id // 100000 - 1]
+
+    def listing_items(self, category, list_page):
+        items = []
+        for position in range(self.articles_per_page):
+            article_id = self.article_id(category, list_page, position)
+            items.append(
+                f'<li class="i_list list_n2"><a href="/{category}/{article_id}.html" target="_blank">'
+                f'<img class="waitpic" src="/uploadfile/poster/{article_id}.webp" alt="模特{article_id}"></a>'
+                f'<div class="case_info"><div class="meta-title">{CATEGORIES[category]}第{article_id}期</div></div></li>')
+        return items
+
+    def listing_html(self, title, items, pagination=''):
+        return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title} - - XiuRen</title></head><body>'
+                f'<div class="update_area"><ul class="update_area_lists cl">{"".join(items)}</ul></div>'
+                f'{pagination}</body></html>')
+
+    async def category(self, request):
+        category = request.match_info['category']
+        list_page = int(request.match_info.get('page') or 1)
+        if category not in CATEGORIES or list_page > self.list_pages:
+            raise web.HTTPNotFound()
+        links = ''.join(
+            f'<a href="/{category}/{"" if page == 1 else f"index{page}.html"}">{page}</a>'
+            for page in range(1, self.list_pages + 1))
+        pagination = f'<div class="page">{links}<a href="/{category}/index{min(list_page + 1, self.list_pages)}.html">下页</a></div>'
+        return web.Response(text=self.listing_html(CATEGORIES[category], self.listing_items(category, list_page), pagination),
+                            content_type='text/html')
+
+    # new.html / hot.html：各分类第一页的文章轮流排列
+    async def ranking(self, request):
+        columns = [self.listing_items(category, 1) for category in CATEGORIES]
+        items = [item for row in zip(*columns) for item in row]
+        return web.Response(text=self.listing_html('最新', items), content_type='text/html')
+
+    async def article(self, request):
+        category = request.match_info['category']
+        article_id = int(request.match_info['article_id'])
+        page = int(request.match_info.get('page') or 0)
+        if category not in CATEGORIES or self.article_category(article_id) != category or page >= self.pages_per_article:
+            raise web.HTTPNotFound()
+        images = ''.join(
+            f'<p><img src="/uploadfile/{article_id}/{page * self.images_per_page + i + 1}.webp" '
+            f'alt="模特{article_id}" title="模特{article_id}"></p>'
+            for i in range(self.images_per_page))
+        links = ''.join(
+            f'<a href="/{category}/{article_id}{"" if index == 0 else f"_{index}"}.html">{index + 1}</a>'
+            for index in range(self.pages_per_article))
+        html_content = (
+            f'<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{CATEGORIES[category]}第{article_id}期模特{article_id}写真 - - XiuRen</title></head><body>'
+            f'<div class="item_title"><a href="/">首页</a> &gt; <a href="/{category}/"><span>{CATEGORIES[category]}</span></a></div>'
+            f'<div class="content">{images}</div>'
+            f'<div class="page">{links}<a href="/{category}/{article_id}_{min(page + 1, self.pages_per_article - 1)}.html">下页</a></div>'
+            f'</body></html>')
+        return web.Response(text=html_content, content_type='text/html')
+
+    async def image(self, request):
+        index = zlib.crc32(request.match_info['tail'].encode()) % len(self.images)
+        return web.Response(body=self.images[index], content_type='image/webp')
+
+    def build_app(self):
+        app = web.Application()
+        app.router.add_get('/new.html', self.ranking)
+        app.router.add_get('/hot.html', self.ranking)
+        app.router.add_get('/uploadfile/{tail:.*}', self.image)
+        app.router.add_get('/{category}/', self.category)
+        app.router.add_get(r'/{category}/index{page:\d+}.html', self.category)
+        app.router.add_get(r'/{category}/{article_id:\d+}.html', self.article)
+        app.router.add_get(r'/{category}/{article_id:\d+}_{page:\d+}.html', self.article)
+        return app
+
+
+
+def serve(port, **options):
+    web.run_app(MockSite(**options).build_app(), host='127.0.0.1', port=port, print=None)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--port', type=int, default=8765)
+    args = arg_parser.parse_args()
+    print(f'模拟站点: http://127.0.0.1:{args.port}/MiiTao/')
+    serve(args.port)
+
+
+if __name__ == '__main__':
+    main()
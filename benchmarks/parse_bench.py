@@ -0,0 +1,85 @@
+"""解析后端对比：检查 fast 与 bs4 两种后端在保存的页面上结果一致，并测量解析耗时。
+
+    python benchmarks/parse_bench.py                     # 使用 benchmarks/pages 中的页面
+    python benchmarks/parse_bench.py --pages saved/ -n 200
+
+页面语料可以直接用浏览器“另存为”的列表页和文章页补充，不一致时以非 0 状态退出。
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawler import parser  # noqa: E402
+
+BASE_URL = "http://25.xy02.my"
+PATH_URLS = ['/MiiTao/', '/XiuRen/', '/Taste/']
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+
+# 用指定后端解析一页，返回所有提取结果
+def parse_all(html_content, backend):
+    parser.set_parser_backend(backend)
+    results = {
+        'articles_info': parser.extract_articles_info(html_content, BASE_URL),
+        'image_urls': parser.extract_image_urls(html_content, BASE_URL),
+        'max_pages': parser.extract_max_pages(html_content),
+    }
+    for path_url in PATH_URLS:
+        for title_mode in ('tag', 'plain'):
+            results[f'title {path_url} {title_mode}'] = parser.extract_article_title(html_content, path_url, title_mode)
+    page = parser.ArticlePage(html_content, BASE_URL, PATH_URLS[0])
+    results['article_page'] = (page.title, page.tag_text, page.max_pages, page.image_urls)
+    return results
+
+
+def check_parity(pages):
+    mismatches = 0
+    for path, html_content in pages.items():
+        fast = parse_all(html_content, 'fast')
+        slow = parse_all(html_content, 'bs4')
+        for key in slow:
+            if fast[key] != slow[key]:
+                mismatches += 1
+                print(f'不一致 {os.path.basename(path)} {key}:\n  fast: {fast[key]}\n  bs4:  {slow[key]}')
+    return mismatches
+
+
+def bench(pages, backend, rounds):
+    parser.set_parser_backend(backend)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for html_content in pages.values():
+            parser.extract_articles_info(html_content, BASE_URL)
+            parser.ArticlePage(html_content, BASE_URL, PATH_URLS[0])
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--pages', default=PAGES_DIR, help='保存的 HTML 页面目录')
+    arg_parser.add_argument('-n', '--rounds', type=int, default=100)
+    args = arg_parser.parse_args()
+
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(args.pages, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages[path] = f.read()
+    if not pages:
+        sys.exit(f'{args.pages} 中没有 HTML 页面')
+
+    mismatches = check_parity(pages)
+    print(f'一致性检查: {len(pages)} 个页面, {mismatches} 处不一致')
+
+    timings = {backend: bench(pages, backend, args.rounds) for backend in ('bs4', 'fast')}
+    total = len(pages) * args.rounds
+    for backend, elapsed in timings.items():
+        print(f'{backend:5s} {total / elapsed:9.1f} 页/秒  耗时 {elapsed:6.2f}s')
+    print(f'fast 相对 bs4 加速 {timings["bs4"] / timings["fast"]:.1f}x')
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+"""秀人集爬虫公共引擎：连接池、页面解析、图片下载与各来源配置。"""
+from .blobstore import ImageStore
+from .cache import PageCache
+from .distributed import ShardWorker, coordinate, discover_last_page
+from .engine import Crawler, PageFetchError, run
+from .lease import WorkQueue, WorkUnit
+from .metrics import Metrics, serve_metrics, dump_metrics
+from .multi import FairQueue, MultiCrawler
+from .retry import RetryPolicy, RetryBudget, CircuitBreaker
+from .scheduler import DownloadScheduler
+from .parser import ArticlePage, extract_article_id
+from .profiles import Profile, BASE_URL, category_profile, new_profile, hot_profile, repair_profile, single_profile
+from .session import create_session
+from .state import CrawlState
+from .storage import IncompleteDownloadError, sniff_format, store_image, list_existing_images, is_image_file, convert_raw_images
+from .transcode import Transcoder
+from .verify import LibraryVerifier, discover_layouts, verify_image, save_report, load_report
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT NOT NULL,
+    storage_mode TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    format TEXT,
+    updated_at REAL,
+    PRIMARY KEY (url, storage_mode)
+);
+"""
+
+# 计算文件哈希时每次读取的字节数
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# 在 target 处创建指向 source 的硬链接，已存在时替换；跨文件系统等不支持硬链接时复制
+# 临时文件名按进程和线程区分，多个线程同时放入相同内容时不会互相删除对方的临时文件
+def link_or_copy(source, target):
+    tmp_path = f'{target}.{os.getpid()}.{threading.get_ident()}.link'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ImageStore:
+    """内容寻址图片库：图片按内容哈希只保存一份，各保存布局中的文件都是指向它的硬链接。
+
+    同一篇文章被分类、NEW、HOT 等来源分别下载时，已在库中的图片地址直接链接，不再发送请求。
+    地址按存储模式（jpeg / raw）分别记录，两种模式保存的文件内容不同。
+    库中的文件只会被整体替换（os.replace），不会原地修改，所以共享硬链接是安全的。
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.db'))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def _path(self, sha256, ext):
+        return os.path.join(self.directory, sha256[:2], sha256 + ext)
+
+    # 图片地址已在库中时链接到 save_stem（不带扩展名），返回 (文件名, 原始格式)；不在库中或文件丢失时返回 None
+    def link(self, url, save_stem, storage_mode):
+        row = self.conn.execute(
+            'SELECT urls.sha256, urls.format, blobs.ext FROM urls JOIN blobs ON blobs.sha256 = urls.sha256 '
+            'WHERE urls.url = ? AND urls.storage_mode = ?', (url, storage_mode)).fetchone()
+        if row is None:
+            return None
+        blob_path = self._path(row['sha256'], row['ext'])
+        if not os.path.exists(blob_path):
+            self.forget(url)
+            return None
+        save_path = save_stem + row['ext']
+        link_or_copy(blob_path, save_path)
+        return os.path.basename(save_path), row['format']
+
+    # 把刚保存的图片放入库中，返回内容哈希；相同内容已在库中时，把 save_path 替换为指向已有文件的链接
+    # 只读写文件、不访问数据库，可以在线程池中执行，之后在事件循环中调用 record()
+    def ingest(self, save_path):
+        sha256 = file_sha256(save_path)
+        blob_path = self._path(sha256, os.path.splitext(save_path)[1])
+        if os.path.exists(blob_path):
+            link_or_copy(blob_path, save_path)
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            link_or_copy(save_path, blob_path)
+        return sha256
+
+    def record(self, url, storage_mode, sha256, filename, fmt):
+        ext = os.path.splitext(filename)[1]
+        now = time.time()
+        with self.conn:
+            self.conn.execute('INSERT OR IGNORE INTO blobs (sha256, ext, size, created_at) VALUES (?, ?, ?, ?)',
+                              (sha256, ext, os.path.getsize(self._path(sha256, ext)), now))
+            self.conn.execute('INSERT OR REPLACE INTO urls (url, storage_mode, sha256, format, updated_at) '
+                              'VALUES (?, ?, ?, ?, ?)', (url, storage_mode, sha256, fmt, now))
+
+    # 删除地址记录，drop_blob=True 时同时删除库中的文件（如校验发现文件损坏），下次会重新下载
+    def forget(self, url, drop_blob=False):
+        rows = self.conn.execute('SELECT blobs.sha256, blobs.ext FROM urls JOIN blobs ON blobs.sha256 = urls.sha256 '
+                                 'WHERE urls.url = ?', (url,)).fetchall()
+        with self.conn:
+            self.conn.execute('DELETE FROM urls WHERE url = ?', (url,))
+            if drop_blob:
+                for row in rows:
+                    self.conn.execute('DELETE FROM blobs WHERE sha256 = ?', (row['sha256'],))
+        if drop_blob:
+            for row in rows:
+                blob_path = self._path(row['sha256'], row['ext'])
+                if os.path.exists(blob_path):
+                    os.remove(blob_path)
+
+    # 统计库中的文件数和总大小
+    def summary(self):
+        row = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs').fetchone()
+        return {'blobs': row[0], 'bytes': row[1]}
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at);
+"""
+
+# 文章页（xxx.html、xxx_N.html）发布后不再变化，其余为列表页（indexN.html、hot.html、new.html）
+ARTICLE_PAGE_RE = re.compile(r'/\d+(_\d+)?\.html$')
+
+# 各类页面的缓存有效期（秒）：None 表示永不过期，0 表示每次都用条件请求重新验证
+DEFAULT_TTLS = {
+    'article': None,
+    'listing': 0,
+}
+
+
+def url_class(url):
+    return 'article' if ARTICLE_PAGE_RE.search(url) else 'listing'
+
+
+class CachedPage:
+    def __init__(self, row, body, fresh):
+        self.url = row['url']
+        self.etag = row['etag']
+        self.last_modified = row['last_modified']
+        self.body = body
+        self.fresh = fresh  # 在有效期内，可以不发请求直接使用
+
+    # 条件请求头
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """磁盘页面缓存：保存页面内容和 ETag/Last-Modified，过期后用条件请求重新验证。
+
+    按 URL 类别设置有效期，总大小超过 max_bytes 时按最近访问时间（LRU）淘汰。
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, ttls=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.db'))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.total_bytes = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename[:2], filename)
+
+    # 查找缓存，没有或文件丢失时返回 None
+    def lookup(self, url):
+        row = self.conn.execute('SELECT * FROM pages WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        try:
+            with open(self._path(row['filename']), encoding='utf-8') as f:
+                body = f.read()
+        except OSError:
+            self._delete(row)
+            return None
+        ttl = self.ttls.get(url_class(url))
+        fresh = ttl is None or time.time() - row['fetched_at'] < ttl
+        with self.conn:
+            self.conn.execute('UPDATE pages SET accessed_at = ? WHERE url = ?', (time.time(), url))
+        return CachedPage(row, body, fresh)
+
+    # 保存页面内容
+    def store(self, url, body, etag=None, last_modified=None):
+        filename = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html'
+        path = self._path(filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+
+        now = time.time()
+        old = self.conn.execute('SELECT size FROM pages WHERE url = ?', (url,)).fetchone()
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (url, filename, etag, last_modified, fetched_at, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', (url, filename, etag, last_modified, now, now, size))
+        self.total_bytes += size - (old['size'] if old else 0)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    # 服务器返回 304，页面未变化，重新计算有效期
+    def revalidated(self, url):
+        with self.conn:
+            self.conn.execute('UPDATE pages SET fetched_at = ? WHERE url = ?', (time.time(), url))
+
+    # 删除一个页面，如内容解析不出图片的占位页、反爬页，下次重新请求
+    def discard(self, url):
+        row = self.conn.execute('SELECT * FROM pages WHERE url = ?', (url,)).fetchone()
+        if row is not None:
+            self._delete(row)
+
+    # 按最近访问时间淘汰，直到总大小降到上限的 90%
+    def evict(self):
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute('SELECT * FROM pages ORDER BY accessed_at').fetchall()
+        for row in rows:
+            if self.total_bytes <= target:
+                break
+            self._delete(row)
+
+    def _delete(self, row):
+        try:
+            os.remove(self._path(row['filename']))
+        except OSError:
+            pass
+        with self.conn:
+            self.conn.execute('DELETE FROM pages WHERE url = ?', (row['url'],))
+        self.total_bytes -= row['size']
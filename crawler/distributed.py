@@ -0,0 +1,114 @@
+import asyncio
+
+from .engine import Crawler
+from .lease import WorkQueue, default_worker_id
+from .parser import extract_max_pages
+
+
+# 读取列表页第一页的分页总数，用于协调者未指定结束页时切分范围
+async def discover_last_page(profile):
+    crawler = Crawler(profile)
+    async with crawler.running():
+        html_content = await crawler.fetch_page(profile.listing_url(1))
+    if html_content is None:
+        return None
+    return extract_max_pages(html_content)
+
+
+# 协调者：把各分类的列表页范围切成工作单元放入队列，返回新增的单元数
+async def coordinate(queue_path, profiles, start_page=1, end_page=None, unit_pages=10):
+    queue = WorkQueue(queue_path)
+    added = 0
+    try:
+        for profile in profiles:
+            last_page = end_page or await discover_last_page(profile)
+            if last_page is None:
+                print(f"无法获取 {profile.listing_url(1)} 的分页总数，跳过")
+                continue
+            count = queue.add_range(profile.base_url + profile.listing_path, start_page, last_page, unit_pages)
+            print(f"{profile.name}: 第【{start_page}-{last_page}】页，新增 {count} 个工作单元")
+            added += count
+        print(f"工作队列: {queue.summary()}")
+    finally:
+        queue.close()
+    return added
+
+
+class ShardWorker:
+    """分片抓取 worker：循环领取工作单元，抓取对应分类的列表页范围，处理期间后台续约。
+
+    make_profile(listing_url) 返回该分类的 Profile。租约被其他 worker 接管时立即停止当前单元，
+    避免两个 worker 重复下载；没有可领取的单元但仍有其他 worker 在处理时，等待它们完成或租约到期。
+    单元处理失败（含范围内的列表页请求失败）时交还队列，retry_delay 秒（按失败次数指数增加）后才能再次领取；
+    领取次数（含租约过期后的重新领取）达到 max_attempts 后标记为 failed，不再分配。
+    """
+
+    def __init__(self, queue_path, make_profile, worker_id=None, lease_seconds=300, poll_interval=30,
+                 max_attempts=5, retry_delay=60):
+        self.queue_path = queue_path
+        self.make_profile = make_profile
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    async def run(self):
+        queue = WorkQueue(self.queue_path)
+        try:
+            while True:
+                unit = queue.claim(self.worker_id, self.lease_seconds)
+                if unit is None:
+                    if not queue.has_unfinished():
+                        break
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                await self.process(queue, unit)
+            print(f"worker {self.worker_id}: 没有待处理的工作单元，队列: {queue.summary()}")
+        finally:
+            queue.close()
+
+    async def process(self, queue, unit):
+        if unit.attempts > self.max_attempts:
+            # 之前的 worker 处理时崩溃或失联，租约多次过期
+            print(f"worker {self.worker_id}: 工作单元 {unit} 已领取 {unit.attempts - 1} 次未完成，不再重试")
+            queue.fail(unit.id, self.worker_id, '租约多次过期')
+            return
+        print(f"worker {self.worker_id}: 领取工作单元 {unit}")
+        crawl = asyncio.create_task(self.crawl(unit))
+        renewer = asyncio.create_task(self.keep_alive(queue, unit, crawl))
+        try:
+            await crawl
+        except asyncio.CancelledError:
+            if not renewer.done():
+                raise  # worker 本身被取消
+            print(f"worker {self.worker_id}: 工作单元 {unit} 的租约已被接管，停止处理")
+            return
+        except Exception as e:
+            if unit.attempts >= self.max_attempts:
+                print(f"worker {self.worker_id}: 工作单元 {unit} 第 {unit.attempts} 次失败，不再重试: {e}")
+                queue.fail(unit.id, self.worker_id, str(e))
+            else:
+                delay = self.retry_delay * 2 ** (unit.attempts - 1)
+                print(f"worker {self.worker_id}: 工作单元 {unit} 第 {unit.attempts} 次失败，{delay} 秒后重试: {e}")
+                queue.release(unit.id, self.worker_id, delay, str(e))
+            return
+        finally:
+            renewer.cancel()
+        queue.complete(unit.id, self.worker_id)
+        print(f"worker {self.worker_id}: 工作单元 {unit} 已完成")
+
+    async def crawl(self, unit):
+        profile = self.make_profile(unit.listing_url)
+        profile.incremental = False  # 水位对应完整遍历，分片抓取不使用增量模式
+        crawler = Crawler(profile)
+        async with crawler.running():
+            await crawler.crawl_listing(unit.start_page, unit.end_page)
+
+    # 每隔三分之一租约时间续约一次，续约失败时取消抓取
+    async def keep_alive(self, queue, unit, crawl):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not queue.renew(unit.id, self.worker_id, self.lease_seconds):
+                crawl.cancel()
+                return
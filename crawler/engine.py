@@ -0,0 +1,645 @@
+import os
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from urllib.parse import urlparse
+
+from .blobstore import ImageStore
+from .cache import PageCache
+from .limiter import HostLimiter
+from .metrics import Metrics, dump_metrics_periodically, serve_metrics
+from .parser import ArticlePage, extract_article_id, extract_articles_info, extract_image_urls, set_parser_backend
+from .retry import (NOT_FOUND, DECODE, LOCAL_KINDS, OVERLOAD_KINDS, RetryPolicy, RetryBudget, CircuitBreaker,
+                    classify_status, classify_exception)
+from .scheduler import DownloadScheduler
+from .session import create_session
+from .state import PENDING, INCOMPLETE, COMPLETE, CrawlState
+from .storage import PART_SUFFIX, IncompleteDownloadError, list_existing_images
+from .transcode import Transcoder
+from .verify import CORRUPT, TRUNCATED
+
+
+# 每批次并发获取的文章分页数量
+PAGE_BATCH_SIZE = 30
+# 条件请求返回 304 时的结果
+NOT_MODIFIED = 'not_modified'
+# 图片流式写入的块大小
+CHUNK_SIZE = 64 * 1024
+
+
+class FailedRequest:
+    """重试用尽后的请求失败结果。"""
+
+    def __init__(self, kind, error):
+        self.kind = kind
+        self.error = error
+
+    def __str__(self):
+        return f"[{self.kind}] {self.error}"
+
+
+class PageFetchError(Exception):
+    """页面请求失败（重试用尽或预算不足），与页面不存在（404）区分。"""
+
+
+class Crawler:
+    """按 Profile 抓取文章并下载图片，所有入口脚本共用同一套实现。"""
+
+    def __init__(self, profile, session=None, metrics=None):
+        self.profile = profile
+        self.base_url = profile.base_url
+        self.session = session
+        self.semaphore = asyncio.Semaphore(profile.max_concurrent_articles)  # 文章级并发
+        self.scheduler = None  # 图片级并发，由 run() 创建
+        self.transcoder = None  # 图片格式转换，由 run() 创建
+        self.retry_policy = RetryPolicy(profile.max_retries, profile.retry_delay, profile.max_retry_delay)
+        self.retry_budget = RetryBudget(profile.retry_budget_ratio, profile.retry_budget_initial)  # 全局重试预算
+        self.breaker = CircuitBreaker()
+        # 单主机在途请求数按 AIMD 自适应调整，并限制请求速率
+        self.host_limiter = HostLimiter(profile.host_concurrency_initial, profile.host_concurrency_min,
+                                        profile.max_images_per_host, profile.latency_target,
+                                        profile.host_rate, profile.host_burst)
+        self.state = None  # SQLite 抓取状态，由 run() 打开
+        self.page_cache = None  # 磁盘页面缓存，由 run() 打开
+        self.image_store = None  # 内容寻址图片库，由 run() 打开
+        self.pages = {}  # 列表页页码 -> {'start_time': 开始时间, 'remaining': 未完成文章数}
+        self.label = None  # 多分类同时抓取时，输出中区分来源的名称
+        self.metrics = metrics or Metrics()  # 吞吐、耗时和错误指标
+
+    # 发送请求并按失败类型重试，handler(response) 处理 200 响应
+    # 返回 handler 的结果，304 返回 NOT_MODIFIED，404 返回 NOT_FOUND，重试用尽或预算不足返回 FailedRequest
+    async def request(self, url, timeout, handler, budget=None, headers=None):
+        host = urlparse(url).netloc
+        if host not in self.host_limiter.limiters:
+            host_limit = self.host_limiter.limiter(host)
+            self.metrics.set_gauge('host_concurrency_limit', lambda: int(host_limit.limit), host=host)
+        attempt = 0
+        while True:
+            attempt += 1
+            await self.breaker.wait(host)
+            self.retry_budget.deposit()
+            if budget:
+                budget.deposit()
+            async with self.host_limiter.slot(host) as limiter:
+                self.metrics.add_gauge('requests_in_flight', 1)
+                start = time.perf_counter()
+                latency = None
+                try:
+                    async with self.session.get(url, timeout=timeout, headers=headers) as response:
+                        latency = time.perf_counter() - start  # 收到响应头的耗时
+                        if response.status == 200:
+                            result = await handler(response)
+                            self.breaker.record(host, True)
+                            limiter.record(False, latency)
+                            return result
+                        if response.status == 304:
+                            self.breaker.record(host, True)
+                            limiter.record(False, latency)
+                            return NOT_MODIFIED
+                        kind = classify_status(response.status)
+                        error = f"状态码 {response.status}"
+                        overloaded = response.status == 429 or kind in OVERLOAD_KINDS
+                except Exception as e:
+                    kind = classify_exception(e)
+                    error = e
+                    overloaded = kind in OVERLOAD_KINDS
+                finally:
+                    self.metrics.add_gauge('requests_in_flight', -1)
+                if kind not in LOCAL_KINDS:
+                    limiter.record(overloaded, latency)
+            self.metrics.inc('request_errors_total', reason=kind)
+            self.breaker.record(host, kind in (NOT_FOUND, DECODE))  # 404 和解码失败不是主机的问题
+            if kind == NOT_FOUND:
+                return NOT_FOUND
+            if not self.retry_policy.should_retry(kind, attempt):
+                return FailedRequest(kind, error)
+            if not self.retry_budget.spend() or (budget and not budget.spend()):
+                self.metrics.inc('retry_budget_exhausted_total')
+                return FailedRequest(kind, f"重试预算已用完: {error}")
+            self.metrics.inc('retries_total', reason=kind)
+            await asyncio.sleep(self.retry_policy.delay(attempt))
+
+    # 1. 异步获取网页源码，revalidate=True 时忽略有效期，总是用条件请求确认页面未变化
+    # 页面不存在返回 None；请求失败时 raise_failure 为 True 则抛出 PageFetchError，否则同样返回 None
+    async def fetch_page(self, url, revalidate=False, raise_failure=False):
+        # 先查磁盘缓存，有效期内直接使用，过期的用条件请求重新验证
+        cached = self.page_cache.lookup(url) if self.page_cache else None
+        if cached and cached.fresh and not revalidate:
+            self.metrics.inc('pages_total', result='cached')
+            return cached.body
+
+        async def read(response):
+            raw = await response.read()
+            self.metrics.inc('page_bytes_total', len(raw))  # 按传输的字节数统计，不是解码后的字符数
+            body = await response.text()  # 复用已读取的内容解码
+            if self.page_cache:
+                self.page_cache.store(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return body
+
+        with self.metrics.timer('page_fetch_seconds'):
+            result = await self.request(url, self.profile.page_timeout, read,
+                                        headers=cached.validators() if cached else None)
+        if result == NOT_MODIFIED:
+            self.metrics.inc('pages_total', result='not_modified')
+            self.page_cache.revalidated(url)
+            return cached.body
+        if result == NOT_FOUND:
+            self.metrics.inc('pages_total', result='not_found')
+            return None  # 不输出 404 警告
+        if isinstance(result, FailedRequest):
+            self.metrics.inc('pages_total', result='failed')
+            print(f"请求页面 {url} 失败: {result}")
+            if raise_failure:
+                raise PageFetchError(f"请求页面 {url} 失败: {result}")
+            return None
+        self.metrics.inc('pages_total', result='fetched')
+        return result
+
+    # 2. 异步下载图片并保存，save_stem 为不带扩展名的保存路径
+    # 成功返回 (文件名, 原始格式)，失败返回 FailedRequest 或 NOT_FOUND
+    async def download_image(self, img_url, save_stem, budget=None):
+        # 图片库中已有该地址时直接链接，不发送请求
+        if self.image_store:
+            stored = self.image_store.link(img_url, save_stem, self.profile.storage_mode)
+            if stored:
+                self.metrics.inc('images_total', result='stored')
+                return stored
+
+        async def save(response):
+            part_path = await self.stream_to_part(response, save_stem)
+            # 按存储模式保存（在线程池/进程池中执行）
+            with self.metrics.timer('transcode_seconds'):
+                filename, fmt = await self.transcoder.transcode(part_path, save_stem)
+            if self.image_store:
+                save_path = os.path.join(os.path.dirname(save_stem), filename)
+                sha256 = await asyncio.to_thread(self.image_store.ingest, save_path)
+                self.image_store.record(img_url, self.profile.storage_mode, sha256, filename, fmt)
+            return filename, fmt
+
+        with self.metrics.timer('image_download_seconds'):
+            result = await self.request(img_url, self.profile.image_timeout, save, budget)
+        if isinstance(result, tuple):
+            self.metrics.inc('images_total', result='downloaded')
+        else:
+            self.metrics.inc('images_total', result='not_found' if result == NOT_FOUND else 'failed')
+        return result
+
+    # 分块写入临时文件并校验 Content-Length，内存占用与图片大小无关
+    async def stream_to_part(self, response, save_stem):
+        part_path = save_stem + PART_SUFFIX
+        received = 0
+        try:
+            with open(part_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    f.write(chunk)
+                    received += len(chunk)
+                    self.metrics.inc('image_bytes_total', len(chunk))
+            # 压缩传输时 Content-Length 是压缩后的长度，无法比较
+            expected = response.content_length
+            if expected is not None and 'Content-Encoding' not in response.headers and received != expected:
+                raise IncompleteDownloadError(f"{response.url}: 期望 {expected} 字节, 实际 {received} 字节")
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        return part_path
+
+    # 3. 异步获取所有页面的图片地址（确保顺序），第一页已由 ArticlePage 解析，不再重复请求
+    # 返回 (图片地址, 分页数, 是否完整)；某一页获取失败时只返回它之前各页的图片，保证图片序号与分页对应
+    async def get_all_image_urls(self, article_url, first_page):
+        image_urls = list(first_page.image_urls)
+        if not image_urls:
+            return image_urls, first_page.max_pages, True  # 第一页没有图片地址，不再处理后续页面
+
+        # 已有图片清单且与第一页一致（分页数相同、第一页图片相同）时，不再遍历分页
+        manifest = self.state.get_manifest(article_url) if self.state else None
+        if manifest and manifest['max_pages'] == first_page.max_pages and \
+                manifest['image_urls'][:len(image_urls)] == image_urls:
+            return manifest['image_urls'], manifest['max_pages'], True
+
+        # 有清单但第一页已变化时，缓存中的分页也可能是旧内容，分页同样用条件请求确认
+        revalidate = manifest is not None
+        max_pages = first_page.max_pages
+        complete = True  # 所有分页都成功获取
+        current_page = 1
+        while current_page < max_pages:
+            # 生成当前批次的页面任务
+            page_indices = range(current_page, min(current_page + PAGE_BATCH_SIZE, max_pages))
+            page_urls = [f"{article_url.replace('.html', '')}_{page_index}.html" for page_index in page_indices]
+            current_page = page_indices[-1] + 1
+
+            # 并发获取当前批次的页面内容
+            results = await asyncio.gather(*[self.fetch_page(url, revalidate=revalidate) for url in page_urls], return_exceptions=True)
+
+            # 按照页码顺序处理结果
+            for page_url, html_content in zip(page_urls, results):
+                if html_content is None or isinstance(html_content, Exception):
+                    # 页面不存在或请求失败，后面各页的图片序号会错位，停在这里，下次运行重新遍历
+                    complete = False
+                    current_page = max_pages
+                    break
+
+                # 提取当前页的图片地址
+                urls = extract_image_urls(html_content, self.base_url)
+                if not urls:
+                    if self.page_cache:
+                        self.page_cache.discard(page_url)  # 可能是占位页或反爬页，不缓存
+                    complete = False  # 没有取到全部分页，不保存为图片清单
+                    current_page = max_pages
+                    break  # 如果没有图片地址，停止处理后续页面
+                image_urls.extend(urls)
+
+        if complete and self.state:
+            self.state.save_manifest(article_url, max_pages, image_urls)
+        return image_urls, max_pages, complete
+
+    # 获取文章信息：标题、保存目录、图片地址等，抓取状态中已有完整记录时不发送请求
+    async def load_article(self, article_info):
+        article_url = article_info['article_url']
+        record = self.state.get_article(article_url) if self.state else None
+        if record is not None and record['status'] != PENDING:
+            return {
+                'title': record['title'],
+                'tag_text': record['tag'],
+                'save_dir': record['save_dir'],
+                'metadata_path': record['metadata_path'],
+                'poster_url': record['poster_url'],
+                'max_pages': record['max_pages'],
+                'image_urls': [row['url'] for row in self.state.get_images(article_url)],
+                'complete': True,
+            }
+
+        # 文章所属分类路径，如 /MiiTao/12345.html -> /MiiTao/
+        article_link = article_url[len(self.base_url):]
+        path_url = article_link[:article_link.find('/', 1) + 1]
+
+        # 已有图片清单时第一页用于和清单对照，不能直接用缓存，要用条件请求确认页面未变化
+        has_manifest = self.state is not None and self.state.get_manifest(article_url) is not None
+        html_content = await self.fetch_page(article_url, revalidate=has_manifest)
+        if not html_content:
+            print(f"无法获取文章页面: {article_url}")
+            return None
+
+        first_page = ArticlePage(html_content, self.base_url, path_url, self.profile.title_mode)
+        article_title, tag_text = first_page.title, first_page.tag_text
+
+        # 获取所有图片地址
+        image_urls, max_pages, complete = await self.get_all_image_urls(article_url, first_page)
+        if not image_urls:
+            if self.page_cache:
+                self.page_cache.discard(article_url)  # 可能是占位页或反爬页，不缓存，下次重新请求
+            print(f"{article_title} {article_url}: 未找到图片")
+            return None
+
+        metadata_path = None
+        if self.profile.metadata_dir:
+            metadata_path = os.path.join(self.profile.metadata_dir.format(tag=tag_text), f"{article_title}.json")
+        article = {
+            'title': article_title,
+            'tag_text': tag_text,
+            'save_dir': os.path.join(self.profile.save_dir.format(tag=tag_text), article_title),
+            'metadata_path': metadata_path,
+            'poster_url': article_info.get('poster_url'),
+            'max_pages': max_pages,
+            'image_urls': image_urls,
+            'complete': complete,
+        }
+        # 分页没有全部获取时不记录图片列表，文章保持 PENDING，下次运行重新遍历分页
+        if self.state and complete:
+            self.state.save_article(article_url, article, image_urls)
+        return article
+
+    # 4. 异步处理单篇文章的下载
+    async def process_article(self, article_info):
+        article_url = article_info['article_url']
+        if self.state and self.state.is_complete(article_url):
+            self.metrics.inc('articles_total', result='skipped')
+            return  # 已完成的文章，不发送任何请求
+
+        async with self.semaphore:  # 限制并发
+            self.metrics.add_gauge('articles_in_progress', 1)
+            try:
+                with self.metrics.timer('article_seconds'):
+                    await self.download_article(article_info)
+            finally:
+                self.metrics.add_gauge('articles_in_progress', -1)
+
+    # 获取文章信息，下载海报和图片，写入 metadata 和抓取状态
+    async def download_article(self, article_info):
+        article_url = article_info['article_url']
+        article = await self.load_article(article_info)
+        if article is None:
+            self.metrics.inc('articles_total', result='failed')
+            return
+        article_title = article['title']
+        poster_url = article['poster_url']
+        image_urls = article['image_urls']
+        max_pages = article['max_pages']
+
+        # 创建子目录
+        save_dir = article['save_dir']
+        os.makedirs(save_dir, exist_ok=True)
+
+        # 已下载的图片，按序号匹配，兼容 raw 模式保存的各种扩展名
+        existing = list_existing_images(save_dir)
+
+        # 下载海报图片（0.jpg）
+        poster_entry = {"url": poster_url, "filename": existing.get("0", "0.jpg"), "status": "success"}
+        if poster_url and "0" not in existing:
+            print(f"开始下载{article_title} {article_url} 海报: {poster_url}")
+            result = await self.scheduler.submit((poster_url, os.path.join(save_dir, "0")))
+            if isinstance(result, tuple):
+                poster_entry["filename"], poster_entry["format"] = result
+            else:
+                poster_entry["status"] = "failed"
+
+        # 记录图片链接和序号
+        metadata = {
+            "article_title": article_title,
+            "article_url": article_url,
+            "images": [poster_entry]
+        }
+
+        # 准备图片下载任务
+        pending = {}  # 图片序号 -> metadata 条目
+        for idx, img_url in enumerate(image_urls):
+            stem = str(idx + 1)  # 图片命名从 1 开始
+            entry = {"url": img_url, "filename": existing.get(stem, f"{stem}.jpg"), "status": "success"}
+            metadata["images"].append(entry)
+
+            # 检查图片是否已经存在
+            if stem not in existing:
+                pending[idx] = entry
+
+        success_count = len(image_urls) - len(pending)
+
+        # 交给全局调度器下载，重试由 RetryPolicy 和本文章的重试预算控制
+        budget = RetryBudget(self.profile.article_retry_ratio, self.profile.article_retry_initial)
+        indices = list(pending)
+        results = await self.scheduler.download_all([
+            (image_urls[idx], os.path.join(save_dir, str(idx + 1)), budget)
+            for idx in indices
+        ])
+
+        failure_count = 0
+        for idx, result in zip(indices, results):
+            if isinstance(result, tuple):
+                success_count += 1
+                pending[idx]["filename"], pending[idx]["format"] = result
+            else:
+                failure_count += 1
+                pending[idx]["status"] = "failed"
+                pending[idx]["error"] = result.kind if isinstance(result, FailedRequest) else str(result)
+
+        # 更新抓取状态（分页不完整时不记录，文章保持 PENDING）
+        if self.state and article['complete']:
+            self.state.update_images(article_url, [(idx + 1, entry) for idx, entry in enumerate(metadata["images"][1:])])
+            self.state.set_article_status(article_url, COMPLETE if failure_count == 0 else INCOMPLETE)
+
+        # 保存 metadata
+        if article['metadata_path']:
+            os.makedirs(os.path.dirname(article['metadata_path']), exist_ok=True)
+            with open(article['metadata_path'], 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, ensure_ascii=False, indent=4)
+
+        # 打印下载结果
+        complete = failure_count == 0 and article['complete']
+        self.metrics.inc('articles_total', result='complete' if complete else 'incomplete')
+        if not article['complete']:
+            print(f"{article_title} {article_url} 共【{max_pages}】分页 : 分页未全部获取，已下载前 {len(image_urls)} 张中的 {success_count} 张，下次运行继续", flush=True)
+        elif failure_count != 0:
+            print(f"{article_title} {article_url} 海报 {poster_url} 共【{max_pages}】分页 : 成功下载 {success_count} 张图片, 失败 {failure_count} 张图片", flush=True)
+        else:
+            print(f"{article_title} {article_url} 海报 {poster_url} 共【{max_pages}】分页 : 成功下载 {success_count} 张图片", flush=True)
+
+    # 5. 流水线处理列表页：生产者提前抓取列表页放入有界队列，下载 worker 持续取文章处理
+    async def crawl_listing(self, start_page=1, end_page=None):
+        queue = asyncio.Queue(maxsize=self.profile.article_queue_size)
+        worker_count = self.profile.max_concurrent_articles
+        newest = {'id': 0, 'watermark': None, 'error': None}
+        self.metrics.set_gauge('article_queue_depth', queue.qsize, source=self.profile.name)
+
+        async def produce():
+            try:
+                newest['id'], newest['watermark'] = await self.produce_listing(queue.put, start_page, end_page)
+            except PageFetchError as e:
+                newest['error'] = e  # 已放入队列的文章继续处理完再抛出
+            finally:
+                for _ in range(worker_count):
+                    await queue.put(None)  # 通知 worker 结束
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                await self.consume_article(*item)
+
+        await asyncio.gather(produce(), *[consume() for _ in range(worker_count)])
+        if newest['error']:
+            raise newest['error']  # 列表页没有遍历完，不更新水位
+        self.update_watermark(newest['id'], newest['watermark'])
+
+    # 遍历列表页，把 (列表页页码, 文章信息) 依次交给 put（队列满时等待）
+    # 列表页不存在视为遍历结束，请求失败时抛出 PageFetchError
+    # 返回 (本次见到的最新文章 ID, 运行前的水位)，供全部文章处理完后 update_watermark 使用
+    async def produce_listing(self, put, start_page=1, end_page=None):
+        watermark = None
+        if self.profile.incremental:
+            if self.state:
+                watermark = self.state.get_watermark()
+            else:
+                print("增量模式需要抓取状态（Profile.state_path），本次完整遍历")
+        newest_id = 0  # 本次运行见到的最新文章 ID
+
+        current_page = start_page
+        while True:
+            # 生成每一页的链接
+            page_url = self.profile.listing_url(current_page)
+
+            # 获取当前页的文章列表
+            print(f'##################### 当前处理第【{current_page}】页: {page_url} #####################\n')
+            start_time = datetime.now()
+            html_content = await self.fetch_page(page_url, raise_failure=True)
+            if html_content is None:
+                break  # 如果页面不存在，停止处理后续页面
+
+            # 提取所有文章信息
+            articles_info = extract_articles_info(html_content, self.base_url)
+            if self.profile.article_limit:
+                articles_info = articles_info[:self.profile.article_limit]
+            if not articles_info:
+                break  # 如果没有文章信息，停止处理后续页面
+
+            # 增量模式：遇到上次运行已完成的文章即停止，之后的文章和分页都不再处理
+            reached_watermark = False
+            if watermark is not None:
+                for position, info in enumerate(articles_info):
+                    if self.is_known_article(info['article_url'], watermark):
+                        print(f"增量模式: {info['article_url']} 已在上次运行中完成，停止遍历")
+                        articles_info = articles_info[:position]
+                        reached_watermark = True
+                        break
+            for info in articles_info:
+                newest_id = max(newest_id, extract_article_id(info['article_url']) or 0)
+
+            # 放入队列，队列满时等待 worker 消费
+            if articles_info:
+                self.pages[current_page] = {'start_time': start_time, 'remaining': len(articles_info)}
+            for info in articles_info:
+                await put((current_page, info))
+
+            if reached_watermark or not self.profile.paginated:
+                break
+            if end_page and current_page >= end_page:
+                break
+            current_page += 1
+        return newest_id, watermark
+
+    # 处理列表页中的一篇文章，该页最后一篇文章完成时输出本页耗时
+    async def consume_article(self, page, info):
+        try:
+            await self.process_article(info)
+        except Exception as e:
+            print(f"处理文章 {info['article_url']} 失败: {e}")
+        finally:
+            state = self.pages[page]
+            state['remaining'] -= 1
+            if state['remaining'] == 0:
+                total_time = datetime.now() - state['start_time']
+                print(f'{self.page_label(page)} 本页下载耗时: {total_time}\n')
+
+    def page_label(self, page):
+        return f'第【{page}】页' if self.label is None else f'【{self.label}】第【{page}】页'
+
+    # 完整运行结束后才更新水位，中途中断时下次仍会完整遍历
+    def update_watermark(self, newest_id, watermark):
+        if self.profile.incremental and self.state and newest_id and newest_id > (watermark or 0):
+            self.state.set_watermark(newest_id)
+
+    # 增量模式下判断文章是否已在之前的运行中完成
+    def is_known_article(self, article_url, watermark):
+        article_id = extract_article_id(article_url)
+        return article_id is not None and article_id <= watermark and self.state.is_complete(article_url)
+
+    # 6. 直接处理指定的文章链接
+    async def crawl_articles(self, article_links):
+        articles_info = [{'article_url': self.base_url + link, 'poster_url': None} for link in article_links]
+        await asyncio.gather(*[self.process_article(info) for info in articles_info])
+
+    # 打开会话、调度器、转换池和本地存储，结束时统一关闭
+    @asynccontextmanager
+    async def running(self):
+        set_parser_backend(self.profile.parser_backend)
+        async with create_session() as session:
+            self.session = session
+            self.scheduler = DownloadScheduler(self.download_image, self.profile.max_in_flight_images)
+            self.transcoder = Transcoder(self.profile.transcode_mode, self.profile.transcode_workers,
+                                         self.profile.transcode_queue_size, self.profile.storage_mode)
+            if self.profile.state_path:
+                self.state = CrawlState(self.profile.state_path, self.profile.name)
+            if self.profile.page_cache_dir:
+                self.page_cache = PageCache(self.profile.page_cache_dir, self.profile.page_cache_max_bytes,
+                                            self.profile.page_cache_ttls)
+            if self.profile.image_store_dir:
+                self.image_store = ImageStore(self.profile.image_store_dir)
+            self.metrics.set_gauge('image_queue_depth', self.scheduler.qsize)
+            metrics_runner = None
+            if self.profile.metrics_port:
+                metrics_runner = await serve_metrics(self.metrics, self.profile.metrics_port)
+            metrics_dumper = None
+            if self.profile.metrics_path:
+                metrics_dumper = asyncio.create_task(dump_metrics_periodically(
+                    self.metrics, self.profile.metrics_path, self.profile.metrics_interval))
+            try:
+                yield self
+            finally:
+                if metrics_dumper:
+                    metrics_dumper.cancel()
+                    await asyncio.gather(metrics_dumper, return_exceptions=True)
+                if metrics_runner:
+                    await metrics_runner.cleanup()
+                await self.scheduler.close()
+                self.transcoder.close()
+                if self.state:
+                    self.state.close()
+                if self.page_cache:
+                    self.page_cache.close()
+                if self.image_store:
+                    self.image_store.close()
+
+    # 与 primary 共用会话、调度器、转换池、缓存和全局限流，抓取状态仍按本来源单独记录
+    def attach(self, primary):
+        self.session = primary.session
+        self.semaphore = primary.semaphore
+        self.scheduler = primary.scheduler
+        self.transcoder = primary.transcoder
+        self.retry_budget = primary.retry_budget
+        self.breaker = primary.breaker
+        self.host_limiter = primary.host_limiter
+        self.page_cache = primary.page_cache
+        self.image_store = primary.image_store
+        self.metrics = primary.metrics
+        if self.profile.state_path:
+            self.state = CrawlState(self.profile.state_path, self.profile.name)
+
+    # 7. 异步主函数
+    async def run(self, start_page=1, end_page=None):
+        async with self.running():
+            if self.profile.article_links:
+                await self.crawl_articles(self.profile.article_links)
+            else:
+                try:
+                    await self.crawl_listing(start_page, end_page)
+                except PageFetchError as e:
+                    print(f"遍历列表页失败: {e}")
+
+    # 8. 只重新下载校验出问题的图片（见 verify.LibraryVerifier），并更新对应的 metadata
+    async def redownload(self, problems):
+        problems = [problem for problem in problems if problem['url']]
+        async with self.running():
+            for problem in problems:
+                # 缺失或下载失败的图片不删除图片库中的文件，库中有完好的文件时 download_image 直接重新链接
+                if problem['reason'] not in (CORRUPT, TRUNCATED):
+                    continue
+                if os.path.exists(problem['path']):
+                    os.remove(problem['path'])  # 删除损坏的文件
+                if self.image_store:
+                    self.image_store.forget(problem['url'], drop_blob=True)  # 图片库中的同一文件也已损坏
+            results = await self.scheduler.download_all([
+                (problem['url'], os.path.join(problem['article_dir'], problem['stem'])) for problem in problems
+            ])
+
+        updates = {}  # metadata 路径 -> {序号: 下载结果}
+        success_count = 0
+        for problem, result in zip(problems, results):
+            if isinstance(result, tuple):
+                success_count += 1
+            if problem['metadata_path']:
+                updates.setdefault(problem['metadata_path'], {})[problem['stem']] = result
+        for metadata_path, stems in updates.items():
+            with open(metadata_path, encoding='utf-8') as f:
+                metadata = json.load(f)
+            for entry in metadata['images']:
+                result = stems.get(os.path.splitext(entry['filename'])[0])
+                if result is None:
+                    continue
+                if isinstance(result, tuple):
+                    entry['filename'], entry['format'] = result
+                    entry['status'] = 'success'
+                    entry.pop('error', None)
+                else:
+                    # 原文件可能已被删除，记录为失败，下次校验时会再次重新下载
+                    entry['status'] = 'failed'
+                    entry['error'] = result.kind if isinstance(result, FailedRequest) else str(result)
+            with open(metadata_path, 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, ensure_ascii=False, indent=4)
+        print(f"重新下载 {len(problems)} 张图片: 成功 {success_count} 张, 失败 {len(problems) - success_count} 张", flush=True)
+
+
+# 按 Profile 运行一次完整抓取
+def run(profile, start_page=1, end_page=None):
+    asyncio.run(Crawler(profile).run(start_page, end_page))
@@ -0,0 +1,128 @@
+"""基于正则的快速解析，只针对站点已知的页面结构。
+
+结构不符合预期时返回 None，由 parser 回退到 BeautifulSoup。
+"""
+import re
+from html import unescape
+
+
+# 标签内的属性文本：= 后引号括起的值可以包含 >（与 html.parser 一致），其余字符到 > 为止
+ATTRS = r'((?:=\s*"[^"]*"|=\s*\'[^\']*\'|[^>])*)'
+TAG_RE = re.compile(r'<(a|img|ul|li|div)\b' + ATTRS + '>', re.I)
+IMG_RE = re.compile(r'<img\b' + ATTRS + '>', re.I)
+PAGE_DIV_RE = re.compile(r'<div\b' + ATTRS + '>', re.I)
+ATTR_RE = re.compile(r'([a-zA-Z_:][-\w:.]*)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'=<>`]+))')
+IGNORED_RE = re.compile(r'<!--.*?-->|<script\b.*?</script\s*>|<style\b.*?</style\s*>', re.S | re.I)
+TITLE_RE = re.compile(r'<title\b[^>]*>(.*?)</title\s*>', re.S | re.I)
+A_TEXT_RE = re.compile(r'<a\b' + ATTRS + r'>(.*?)</a\s*>', re.S | re.I)
+INNER_TAG_RE = re.compile(r'<[^>]+>')
+
+
+# 解析标签属性，同名属性以第一个为准（与 html.parser 一致）
+def parse_attrs(attr_text):
+    attrs = {}
+    for name, dq, sq, bare in ATTR_RE.findall(attr_text):
+        name = name.lower()
+        if name not in attrs:
+            attrs[name] = unescape(dq or sq or bare)
+    return attrs
+
+
+def normalize_class(value):
+    return ' '.join(value.split())
+
+
+# 去掉注释、脚本和样式，它们里面的标签不会被 BeautifulSoup 解析为元素
+def strip_ignored(html_content):
+    return IGNORED_RE.sub('', html_content)
+
+
+def tag_text(inner_html):
+    return unescape(INNER_TAG_RE.sub('', inner_html))
+
+
+# 提取文章 URL 和海报地址
+def extract_articles_info(html_content, base_url):
+    html_content = strip_ignored(html_content)
+    start = None
+    for match in TAG_RE.finditer(html_content):
+        if match.group(1).lower() == 'ul' and \
+                normalize_class(parse_attrs(match.group(2)).get('class', '')) == 'update_area_lists cl':
+            start = match.end()
+            break
+    if start is None:
+        return None
+    end = html_content.find('</ul', start)
+    if end == -1 or html_content.find('<ul', start, end) != -1:
+        return None  # 嵌套列表，交给 BeautifulSoup
+    area = html_content[start:end]
+
+    articles_info = []
+    article = None
+    for match in TAG_RE.finditer(area):
+        name = match.group(1).lower()
+        attrs = parse_attrs(match.group(2))
+        if name == 'li':
+            article = None
+            if normalize_class(attrs.get('class', '')) == 'i_list list_n2':
+                article = {'article_url': None, 'poster_url': None}
+                articles_info.append(article)
+        elif article is None:
+            continue
+        elif name == 'a' and article['article_url'] is None:
+            if 'href' not in attrs:
+                return None
+            article['article_url'] = base_url + attrs['href']
+        elif name == 'img' and article['poster_url'] is None and 'waitpic' in attrs.get('class', '').split():
+            if attrs.get('src'):
+                article['poster_url'] = base_url + attrs['src']
+    if any(article['article_url'] is None for article in articles_info):
+        return None
+    return articles_info
+
+
+# 提取当前页面的图片 URL
+def extract_image_urls(html_content, base_url, prefixes):
+    image_urls = []
+    for match in IMG_RE.finditer(strip_ignored(html_content)):
+        if not any(prefix in match.group(1) for prefix in prefixes):
+            continue  # 先做字符串筛选，只解析可能符合条件的标签
+        attrs = parse_attrs(match.group(1))
+        src = attrs.get('src')
+        if src and src.startswith(prefixes) and attrs.get('alt') and attrs.get('title'):
+            image_urls.append(base_url + src)
+    return image_urls
+
+
+# 提取文章标题和分类名，返回 (原始标题, 分类名)
+def extract_title_parts(html_content, path_url):
+    html_content = strip_ignored(html_content)
+    title_match = TITLE_RE.search(html_content)
+    if title_match is None:
+        return None
+    tag = None
+    for match in A_TEXT_RE.finditer(html_content):
+        if parse_attrs(match.group(1)).get('href') == path_url:
+            tag = tag_text(match.group(2))
+            break
+    return unescape(title_match.group(1)).strip(), tag
+
+
+# 解析文章分页总数，找不到分页结构时返回 1
+def extract_max_pages(html_content):
+    html_content = strip_ignored(html_content)
+    for match in PAGE_DIV_RE.finditer(html_content):
+        if 'page' not in parse_attrs(match.group(1)).get('class', '').split():
+            continue
+        end = html_content.find('</div', match.end())
+        if end == -1 or html_content.find('<div', match.end(), end) != -1:
+            return None  # 嵌套 div，交给 BeautifulSoup
+        links = [tag_text(text) for _, text in A_TEXT_RE.findall(html_content[match.end():end])]
+        if len(links) > 1:
+            # 最后一个链接是“下页”，倒数第二个链接是最后一页的页码
+            try:
+                return int(links[-2])
+            except ValueError:
+                pass
+        return 1
+    return 1
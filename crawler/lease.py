@@ -0,0 +1,129 @@
+import os
+import socket
+import sqlite3
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    listing_url TEXT NOT NULL,
+    start_page INTEGER NOT NULL,
+    end_page INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL,
+    error TEXT,
+    updated_at REAL,
+    UNIQUE (listing_url, start_page, end_page)
+);
+CREATE INDEX IF NOT EXISTS idx_units_status ON units (status, lease_until);
+"""
+
+# 工作单元状态
+PENDING = 'pending'  # 等待领取
+LEASED = 'leased'  # 已被 worker 领取，租约到期前不会再分配
+DONE = 'done'  # 已完成
+FAILED = 'failed'  # 失败次数达到上限，不再分配
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkUnit:
+    def __init__(self, row):
+        self.id = row['id']
+        self.listing_url = row['listing_url']  # 分类地址，如 http://25.xy02.my/MiiTao/
+        self.start_page = row['start_page']
+        self.end_page = row['end_page']
+        self.attempts = row['attempts']
+
+    def __str__(self):
+        return f"#{self.id} {self.listing_url} 第【{self.start_page}-{self.end_page}】页"
+
+
+class WorkQueue:
+    """基于 SQLite 的租约工作队列，用于多个 worker（可在不同机器上）分片抓取。
+
+    协调者把列表页范围切成工作单元；worker 领取单元时获得租约，处理期间定期续约，
+    完成后标记为 done。worker 崩溃或失联时租约到期，单元会被其他 worker 重新领取。
+    多台机器共用时，数据库文件需放在支持文件锁的共享存储上。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)  # 手动管理事务
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # 协调者：把 [start_page, end_page] 按 unit_pages 页一组切分，返回新增的单元数（已有的单元不重复添加）
+    def add_range(self, listing_url, start_page, end_page, unit_pages=10):
+        now = time.time()
+        units = [(listing_url, first, min(first + unit_pages - 1, end_page), now)
+                 for first in range(start_page, end_page + 1, unit_pages)]
+        before = self.conn.total_changes
+        self.conn.execute('BEGIN IMMEDIATE')
+        self.conn.executemany('INSERT OR IGNORE INTO units (listing_url, start_page, end_page, updated_at) '
+                              'VALUES (?, ?, ?, ?)', units)
+        self.conn.execute('COMMIT')
+        return self.conn.total_changes - before
+
+    # 领取一个等待中（已过退避时间）或租约已过期的单元，没有可领取的单元时返回 None
+    def claim(self, worker, lease_seconds):
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')  # 写锁，保证同一单元只会被一个 worker 领取
+        try:
+            row = self.conn.execute(
+                'SELECT * FROM units WHERE (status = ? AND (not_before IS NULL OR not_before <= ?)) '
+                'OR (status = ? AND lease_until < ?) ORDER BY id LIMIT 1',
+                (PENDING, now, LEASED, now)).fetchone()
+            if row is None:
+                self.conn.execute('COMMIT')
+                return None
+            self.conn.execute('UPDATE units SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1, '
+                              'updated_at = ? WHERE id = ?', (LEASED, worker, now + lease_seconds, now, row['id']))
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return WorkUnit(self.conn.execute('SELECT * FROM units WHERE id = ?', (row['id'],)).fetchone())
+
+    # 续约，租约已被其他 worker 接管时返回 False
+    def renew(self, unit_id, worker, lease_seconds):
+        now = time.time()
+        cursor = self.conn.execute('UPDATE units SET lease_until = ?, updated_at = ? '
+                                   'WHERE id = ? AND worker = ? AND status = ?',
+                                   (now + lease_seconds, now, unit_id, worker, LEASED))
+        return cursor.rowcount == 1
+
+    def complete(self, unit_id, worker):
+        self.conn.execute('UPDATE units SET status = ?, lease_until = NULL, updated_at = ? WHERE id = ? AND worker = ?',
+                          (DONE, time.time(), unit_id, worker))
+
+    # 主动交还单元（如处理失败），delay 秒后才能再次被领取
+    def release(self, unit_id, worker, delay=0, error=None):
+        now = time.time()
+        self.conn.execute('UPDATE units SET status = ?, worker = NULL, lease_until = NULL, not_before = ?, error = ?, '
+                          'updated_at = ? WHERE id = ? AND worker = ? AND status = ?',
+                          (PENDING, now + delay, error, now, unit_id, worker, LEASED))
+
+    # 失败次数达到上限，标记为 failed，不再分配
+    def fail(self, unit_id, worker, error=None):
+        self.conn.execute('UPDATE units SET status = ?, lease_until = NULL, error = ?, updated_at = ? '
+                          'WHERE id = ? AND worker = ? AND status = ?', (FAILED, error, time.time(), unit_id, worker, LEASED))
+
+    # 是否还有未完成的单元（包括其他 worker 正在处理的和退避中的），failed 的单元不再处理
+    def has_unfinished(self):
+        return self.conn.execute('SELECT 1 FROM units WHERE status IN (?, ?) LIMIT 1',
+                                 (PENDING, LEASED)).fetchone() is not None
+
+    # 统计各状态的单元数
+    def summary(self):
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM units GROUP BY status').fetchall())
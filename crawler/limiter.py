@@ -0,0 +1,115 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class AdaptiveLimiter:
+    """AIMD 自适应并发上限：请求健康时加性增加，超时/5xx/429 时乘性减小。
+
+    每个健康的请求使上限增加 1/上限，即大约每轮（上限个请求）加 1；
+    过载时上限乘以 backoff，cooldown 秒内只减一次，避免同一批并发失败把上限连续压到最低。
+    响应时间（收到响应头）超过 latency_target 也视为过载的前兆。
+    """
+
+    def __init__(self, initial=8, min_limit=1, max_limit=32, latency_target=3.0, backoff=0.5, cooldown=1.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.last_decrease = 0.0
+        self.waiters = deque()
+
+    async def acquire(self):
+        while self.in_flight >= int(self.limit):
+            future = asyncio.get_running_loop().create_future()
+            self.waiters.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future in self.waiters:
+                    self.waiters.remove(future)
+                elif future.done() and not future.cancelled():
+                    self._wake()  # 已被唤醒但被取消，把名额让给下一个
+                raise
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    # 按空出的名额唤醒等待者
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self.waiters:
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                free -= 1
+
+    # 记录一次请求结果：overloaded 为超时、5xx、429 或连接错误，latency 为收到响应头的耗时（秒）
+    def record(self, overloaded, latency=None):
+        if overloaded or (latency is not None and latency > self.latency_target):
+            now = time.monotonic()
+            if now - self.last_decrease >= self.cooldown:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self.last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._wake()
+
+
+class TokenBucket:
+    """令牌桶：平均每秒 rate 个请求，最多连续 burst 个。"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()  # 按到达顺序发放令牌
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    """按主机限制请求：AIMD 自适应并发 + 令牌桶速率上限（rate 为 None 时不限速率）。"""
+
+    def __init__(self, initial=8, min_limit=1, max_limit=32, latency_target=3.0, rate=None, burst=None):
+        self.options = {'initial': initial, 'min_limit': min_limit, 'max_limit': max_limit,
+                        'latency_target': latency_target}
+        self.rate = rate
+        self.burst = burst
+        self.limiters = {}
+        self.buckets = {}
+
+    def limiter(self, host):
+        if host not in self.limiters:
+            self.limiters[host] = AdaptiveLimiter(**self.options)
+        return self.limiters[host]
+
+    # 占用该主机的一个请求名额，返回 AdaptiveLimiter，请求结束前用它 record() 结果
+    @asynccontextmanager
+    async def slot(self, host):
+        if self.rate:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+            await self.buckets[host].acquire()
+        limiter = self.limiter(host)
+        await limiter.acquire()
+        try:
+            yield limiter
+        finally:
+            limiter.release()
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from aiohttp import web
+
+
+# 指标名前缀
+PREFIX = 'xiuren_'
+# 耗时直方图的桶上限（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)  # 每个桶的累计数（<= 上限）
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Metrics:
+    """抓取指标：计数器、直方图和仪表（当前值），可输出为 Prometheus 文本格式或 JSON。
+
+    只在事件循环线程中更新，不加锁。仪表可以是数值，也可以是取值函数（如队列长度），输出时才读取。
+    """
+
+    def __init__(self):
+        self.counters = {}  # (名称, 标签) -> 数值
+        self.histograms = {}  # (名称, 标签) -> Histogram
+        self.gauges = {}  # (名称, 标签) -> 数值或函数
+        self.started_at = time.time()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram()
+        self.histograms[key].observe(value)
+
+    def set_gauge(self, name, value, **labels):
+        self.gauges[self._key(name, labels)] = value
+
+    def add_gauge(self, name, delta, **labels):
+        key = self._key(name, labels)
+        self.gauges[key] = self.gauges.get(key, 0) + delta
+
+    # 统计代码块的耗时：with metrics.timer('page_fetch_seconds'): ...
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def _gauge_values(self):
+        for key, value in self.gauges.items():
+            yield key, value() if callable(value) else value
+
+    # Prometheus 文本格式
+    def render_prometheus(self):
+        lines = []
+        typed = set()
+
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {PREFIX}{name} {kind}')
+
+        for (name, labels), value in sorted(self.counters.items()):
+            declare(name, 'counter')
+            lines.append(f'{PREFIX}{name}{format_labels(labels)} {value}')
+        for (name, labels), value in sorted(self._gauge_values()):
+            declare(name, 'gauge')
+            lines.append(f'{PREFIX}{name}{format_labels(labels)} {value}')
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            declare(name, 'histogram')
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{PREFIX}{name}_bucket{format_labels(labels + (("le", bound),))} {count}')
+            lines.append(f'{PREFIX}{name}_bucket{format_labels(labels + (("le", "+Inf"),))} {histogram.count}')
+            lines.append(f'{PREFIX}{name}_sum{format_labels(labels)} {histogram.sum}')
+            lines.append(f'{PREFIX}{name}_count{format_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    # JSON 快照，直方图只保留次数、总和和平均值
+    def snapshot(self):
+        def name_of(name, labels):
+            return name + format_labels(labels)
+
+        return {
+            'uptime': time.time() - self.started_at,
+            'counters': {name_of(*key): value for key, value in sorted(self.counters.items())},
+            'gauges': {name_of(*key): value for key, value in sorted(self._gauge_values())},
+            'histograms': {
+                name_of(*key): {'count': h.count, 'sum': h.sum, 'avg': h.sum / h.count if h.count else 0}
+                for key, h in sorted(self.histograms.items())
+            },
+        }
+
+
+# 在 port 上提供 /metrics（Prometheus 文本）和 /metrics.json，返回 runner，结束时调用 runner.cleanup()
+async def serve_metrics(metrics, port, host='127.0.0.1'):
+    async def prometheus(request):
+        return web.Response(text=metrics.render_prometheus(), content_type='text/plain')
+
+    async def snapshot(request):
+        return web.json_response(metrics.snapshot())
+
+    app = web.Application()
+    app.router.add_get('/metrics', prometheus)
+    app.router.add_get('/metrics.json', snapshot)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"指标: http://{host}:{port}/metrics")
+    return runner
+
+
+def dump_metrics(metrics, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(metrics.snapshot(), f, ensure_ascii=False, indent=4)
+    # 原子替换，读取方不会看到写了一半的文件
+    os.replace(tmp_path, path)
+
+
+# 每隔 interval 秒把指标快照写入 path，取消时再写一次最终结果
+async def dump_metrics_periodically(metrics, path, interval=30):
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            dump_metrics(metrics, path)
+    finally:
+        dump_metrics(metrics, path)
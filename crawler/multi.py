@@ -0,0 +1,105 @@
+import asyncio
+from collections import deque
+
+from .engine import Crawler
+
+
+class FairQueue:
+    """按权重轮询的多来源有界队列。
+
+    每个来源有自己的队列（上限 maxsize），get() 轮流从各来源取，权重为 w 的来源每轮最多连续取 w 个；
+    某个来源暂时没有文章时跳过，不会让其他来源等待，文章很多的来源也不会占满所有 worker。
+    """
+
+    def __init__(self, weights, maxsize):
+        self.names = list(weights)
+        self.weights = weights
+        self.maxsize = maxsize
+        self.queues = {name: deque() for name in self.names}
+        self.closed = set()
+        self.current = 0  # 当前轮到的来源
+        self.credits = weights[self.names[0]] if self.names else 0  # 当前来源本轮剩余次数
+        self.condition = asyncio.Condition()
+
+    async def put(self, name, item):
+        async with self.condition:
+            await self.condition.wait_for(lambda: len(self.queues[name]) < self.maxsize)
+            self.queues[name].append(item)
+            self.condition.notify_all()
+
+    # 来源的生产者结束
+    async def close(self, name):
+        async with self.condition:
+            self.closed.add(name)
+            self.condition.notify_all()
+
+    # 返回 (来源, 元素)，所有来源都结束且队列为空时返回 None
+    async def get(self):
+        async with self.condition:
+            while True:
+                for _ in range(len(self.names) + 1):  # 多一次，回到本轮次数已用完的来源
+                    name = self.names[self.current]
+                    if self.queues[name] and self.credits > 0:
+                        item = self.queues[name].popleft()
+                        self.credits -= 1
+                        self.condition.notify_all()
+                        return name, item
+                    self._advance()
+                if len(self.closed) == len(self.names):
+                    return None
+                await self.condition.wait()
+
+    def _advance(self):
+        self.current = (self.current + 1) % len(self.names)
+        self.credits = self.weights[self.names[self.current]]
+
+
+class MultiCrawler:
+    """一次运行同时抓取多个分类。
+
+    所有分类共用第一个 Profile 的会话、图片调度器、转换池、页面缓存、图片库和全局限流参数；
+    各分类的列表页由各自的生产者预取，文章 worker 通过 FairQueue 按权重轮流处理各分类的文章。
+    """
+
+    def __init__(self, profiles, weights=None):
+        self.crawlers = {profile.name: Crawler(profile) for profile in profiles}
+        for name, crawler in self.crawlers.items():
+            crawler.label = name
+        self.weights = {name: max(1, (weights or {}).get(name, 1)) for name in self.crawlers}
+
+    async def run(self, start_page=1, end_page=None):
+        primary, *others = self.crawlers.values()
+        worker_count = primary.profile.max_concurrent_articles
+        queue = FairQueue(self.weights, primary.profile.article_queue_size)
+        newest = {}
+
+        async def produce(name, crawler):
+            try:
+                newest[name] = await crawler.produce_listing(lambda item: queue.put(name, item), start_page, end_page)
+            except Exception as e:
+                print(f"【{name}】遍历列表页失败: {e}")
+            finally:
+                await queue.close(name)
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                name, (page, info) = item
+                await self.crawlers[name].consume_article(page, info)
+
+        async with primary.running():
+            for name, crawler in self.crawlers.items():
+                if crawler is not primary:
+                    crawler.attach(primary)
+                primary.metrics.set_gauge('article_queue_depth', lambda name=name: len(queue.queues[name]), source=name)
+            try:
+                await asyncio.gather(*[produce(name, crawler) for name, crawler in self.crawlers.items()],
+                                     *[consume() for _ in range(worker_count)])
+                for name, (newest_id, watermark) in newest.items():
+                    self.crawlers[name].update_watermark(newest_id, watermark)
+            finally:
+                for crawler in others:
+                    if crawler.state:
+                        crawler.state.close()
@@ -0,0 +1,146 @@
+import re
+
+from bs4 import BeautifulSoup
+
+from . import fastparse
+
+
+# 图片地址前缀
+IMAGE_PREFIXES = ('/uploadfile/', '/UploadFile/')
+
+# 文章 ID，如 /MiiTao/16708.html -> 16708
+ARTICLE_ID_RE = re.compile(r'/(\d+)\.html$')
+
+# 解析后端：'fast' 先用正则快速解析，结构不符合预期时回退到 BeautifulSoup；'bs4' 始终使用 BeautifulSoup
+PARSER_BACKEND = 'fast'
+
+
+def set_parser_backend(backend):
+    global PARSER_BACKEND
+    if backend not in ('fast', 'bs4'):
+        raise ValueError(f"未知的解析后端: {backend}")
+    PARSER_BACKEND = backend
+
+
+def make_soup(html_content):
+    return BeautifulSoup(html_content, 'html.parser')
+
+
+# 1. 提取文章 URL 和海报地址
+def extract_articles_info(html_content, base_url):
+    if PARSER_BACKEND == 'fast':
+        articles_info = fastparse.extract_articles_info(html_content, base_url)
+        if articles_info is not None:
+            return articles_info
+    return articles_info_from_soup(make_soup(html_content), base_url)
+
+
+def articles_info_from_soup(soup, base_url):
+    update_area = soup.find('ul', class_='update_area_lists cl')
+    if update_area is None:
+        return []
+    articles = update_area.find_all('li', class_='i_list list_n2')
+
+    articles_info = []
+    for article in articles:
+        # 提取文章 URL
+        article_link = article.find('a')['href']
+        article_url = base_url + article_link
+
+        # 提取海报地址
+        poster_img = article.find('img', class_='waitpic')
+        poster_url = base_url + poster_img['src'] if poster_img and poster_img.get('src') else None
+
+        # 添加到结果列表
+        articles_info.append({
+            'article_url': article_url,
+            'poster_url': poster_url
+        })
+
+    return articles_info
+
+
+# 2. 提取当前页面的图片 URL
+def extract_image_urls(html_content, base_url):
+    if PARSER_BACKEND == 'fast':
+        return fastparse.extract_image_urls(html_content, base_url, IMAGE_PREFIXES)
+    return image_urls_from_soup(make_soup(html_content), base_url)
+
+
+def image_urls_from_soup(soup, base_url):
+    return [
+        base_url + img['src']
+        for img in soup.find_all('img')
+        if img.get('src') and img['src'].startswith(IMAGE_PREFIXES) and img.get('alt') and img.get('title')
+    ]
+
+
+# 3. 提取文章标题和分类名
+def extract_article_title(html_content, path_url, title_mode='tag'):
+    if PARSER_BACKEND == 'fast':
+        parts = fastparse.extract_title_parts(html_content, path_url)
+        if parts is not None:
+            raw_title, tag_text = parts
+            tag_text = tag_text if tag_text is not None else path_url.strip('/')
+            return clean_title(raw_title, tag_text, title_mode), tag_text
+    return title_from_soup(make_soup(html_content), path_url, title_mode)
+
+
+def title_from_soup(soup, path_url, title_mode='tag'):
+    tag_link = soup.find('a', href=f'{path_url}')
+    tag_text = tag_link.text if tag_link else path_url.strip('/')
+    title_tag = soup.find('title')
+    if title_tag:
+        article_title = clean_title(title_tag.text.strip(), tag_text, title_mode)
+    else:
+        article_title = "未知标题"
+    return article_title, tag_text
+
+
+def clean_title(article_title, tag_text, title_mode):
+    if title_mode == 'tag':
+        return article_title.replace(" - - XiuRen", "").replace(f"{tag_text}第", "")
+    return article_title.replace("XiuRen秀人网第", "").replace(" - - XiuRen", "")
+
+
+# 4. 解析文章分页总数
+def extract_max_pages(html_content):
+    if PARSER_BACKEND == 'fast':
+        max_pages = fastparse.extract_max_pages(html_content)
+        if max_pages is not None:
+            return max_pages
+    return max_pages_from_soup(make_soup(html_content))
+
+
+def max_pages_from_soup(soup):
+    pagination_div = soup.find('div', class_='page')
+    if pagination_div:
+        pagination_links = pagination_div.find_all('a')
+        if len(pagination_links) > 1:
+            # 最后一个链接是“下页”，倒数第二个链接是最后一页的页码
+            try:
+                return int(pagination_links[-2].text)
+            except ValueError:
+                pass
+    return 1  # 没有分页 div 或分页链接，说明只有一页
+
+
+# 5. 从文章地址提取文章 ID，无法识别时返回 None
+def extract_article_id(article_url):
+    match = ARTICLE_ID_RE.search(article_url)
+    return int(match.group(1)) if match else None
+
+
+class ArticlePage:
+    """文章第一页只解析一次，同时得到标题、分类名、分页总数和本页图片地址。"""
+
+    def __init__(self, html_content, base_url, path_url, title_mode='tag'):
+        if PARSER_BACKEND == 'fast':
+            self.title, self.tag_text = extract_article_title(html_content, path_url, title_mode)
+            self.max_pages = extract_max_pages(html_content)
+            self.image_urls = extract_image_urls(html_content, base_url)
+            return
+        soup = make_soup(html_content)
+        self.title, self.tag_text = title_from_soup(soup, path_url, title_mode)
+        self.max_pages = max_pages_from_soup(soup)
+        self.image_urls = image_urls_from_soup(soup, base_url)
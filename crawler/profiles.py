@@ -0,0 +1,120 @@
+from urllib.parse import urlparse
+
+
+# 基础 URL
+BASE_URL = "http://25.xy02.my"
+
+
+class Profile:
+    """一个抓取来源的配置：列表页位置、保存布局、重试与并发参数。
+
+    save_dir / metadata_dir 为路径模板，{tag} 会替换为文章所属分类名；
+    metadata_dir 为 None 时不写 metadata。
+    """
+
+    def __init__(self, name, listing_path=None, paginated=False, article_limit=None, article_links=None,
+                 title_mode='tag', save_dir='{tag}', metadata_dir='{tag}_metadata',
+                 max_retries=10, retry_delay=1, max_retry_delay=60, max_concurrent_articles=100,
+                 retry_budget_ratio=0.2, retry_budget_initial=100, article_retry_ratio=0.5, article_retry_initial=10,
+                 max_in_flight_images=64, max_images_per_host=32, article_queue_size=200,
+                 transcode_mode='thread', transcode_workers=None, transcode_queue_size=32, storage_mode='jpeg',
+                 parser_backend='fast', state_path='crawl_state.db', incremental=False,
+                 page_cache_dir='page_cache', page_cache_max_bytes=512 * 1024 * 1024, page_cache_ttls=None,
+                 image_store_dir='image_store', metrics_port=None, metrics_path=None, metrics_interval=30,
+                 host_concurrency_initial=8, host_concurrency_min=1, latency_target=3.0, host_rate=50, host_burst=None,
+                 page_timeout=10, image_timeout=5, base_url=BASE_URL):
+        self.name = name
+        self.base_url = base_url
+        self.listing_path = listing_path  # 列表页路径，如 /MiiTao/、/hot.html
+        self.paginated = paginated  # 列表页是否有 indexN.html 分页
+        self.article_limit = article_limit  # 每个列表页最多处理的文章数
+        self.article_links = article_links or []  # 单章模式下直接指定的文章链接
+        self.title_mode = title_mode  # 'tag': 标题去掉分类前缀；'plain': 去掉 "XiuRen秀人网第"
+        self.save_dir = save_dir
+        self.metadata_dir = metadata_dir
+        self.max_retries = max_retries  # 单个请求最大尝试次数
+        self.retry_delay = retry_delay  # 指数退避的基础等待时间（秒）
+        self.max_retry_delay = max_retry_delay  # 单次退避等待上限（秒）
+        self.retry_budget_ratio = retry_budget_ratio  # 全局：每个请求增加的重试额度
+        self.retry_budget_initial = retry_budget_initial  # 全局：初始重试额度
+        self.article_retry_ratio = article_retry_ratio  # 单篇文章：每个请求增加的重试额度
+        self.article_retry_initial = article_retry_initial  # 单篇文章：初始重试额度
+        self.max_concurrent_articles = max_concurrent_articles  # 同时处理的文章数（流水线宽度），请求并发由 HostLimiter 控制
+        self.article_queue_size = article_queue_size  # 列表页预取的文章数上限
+        self.max_in_flight_images = max_in_flight_images  # 全局同时分派的图片任务数（含等待主机名额和重试退避中的）
+        self.max_images_per_host = max_images_per_host  # 单主机同时在途的请求数上限（自适应并发不超过该值）
+        self.host_concurrency_initial = host_concurrency_initial  # 单主机自适应并发的初始值
+        self.host_concurrency_min = host_concurrency_min  # 单主机自适应并发的下限
+        self.latency_target = latency_target  # 响应头耗时超过该值（秒）视为过载，减小并发
+        self.host_rate = host_rate  # 单主机每秒请求数上限（令牌桶），None 表示不限
+        self.host_burst = host_burst  # 令牌桶容量，默认等于 host_rate
+        self.transcode_mode = transcode_mode  # 'thread'、'process' 或 'inline'
+        self.transcode_workers = transcode_workers  # 转换 worker 数，默认 CPU 核数
+        self.transcode_queue_size = transcode_queue_size  # 等待转换的图片上限
+        self.storage_mode = storage_mode  # 'jpeg': 统一保存为 JPG；'raw': 按原始格式保存
+        self.parser_backend = parser_backend  # 'fast': 正则快速解析，必要时回退 bs4；'bs4': 始终用 BeautifulSoup
+        self.state_path = state_path  # SQLite 抓取状态文件，None 表示不记录（每次都重新抓取）
+        self.incremental = incremental  # 增量模式：遇到上次运行已完成的文章即停止遍历列表页
+        self.page_cache_dir = page_cache_dir  # 磁盘页面缓存目录，None 表示不缓存
+        self.page_cache_max_bytes = page_cache_max_bytes  # 页面缓存大小上限，超过后按 LRU 淘汰
+        self.page_cache_ttls = page_cache_ttls  # 各类页面的有效期，见 cache.DEFAULT_TTLS
+        self.image_store_dir = image_store_dir  # 内容寻址图片库目录（保存布局中的文件为硬链接），None 表示不使用
+        self.metrics_port = metrics_port  # 在该端口提供 /metrics（Prometheus 文本）和 /metrics.json，None 表示不开启
+        self.metrics_path = metrics_path  # 定期把指标快照写入该 JSON 文件，None 表示不写
+        self.metrics_interval = metrics_interval  # 指标快照写入间隔（秒）
+        self.page_timeout = page_timeout
+        self.image_timeout = image_timeout
+
+    # 生成第 N 页列表页的链接
+    def listing_url(self, page):
+        if page == 1:
+            return self.base_url + self.listing_path
+        return self.base_url + f"{self.listing_path}index{page}.html"
+
+
+# 分类全站下载，如 http://25.xy02.my/MiiTao/
+def category_profile(url, **kwargs):
+    parsed_url = urlparse(url)
+    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+    return Profile(parsed_url.path.strip('/') or 'category', listing_path=parsed_url.path, paginated=True,
+                   base_url=base_url, **kwargs)
+
+
+# 最新更新 new.html（只取前 20 篇）
+def new_profile(**kwargs):
+    kwargs.setdefault('article_limit', 20)
+    return Profile('new', listing_path='/new.html', **kwargs)
+
+
+# 热门文章 hot.html
+def hot_profile(**kwargs):
+    kwargs.setdefault('title_mode', 'plain')
+    kwargs.setdefault('save_dir', 'photos')
+    kwargs.setdefault('metadata_dir', 'metadata')
+    kwargs.setdefault('max_retries', 5)
+    kwargs.setdefault('max_concurrent_articles', 3)
+    kwargs.setdefault('max_in_flight_images', 8)
+    kwargs.setdefault('max_images_per_host', 8)
+    kwargs.setdefault('image_timeout', 10)
+    return Profile('hot', listing_path='/hot.html', **kwargs)
+
+
+# 修复 /XiuRen/ 分类的 metadata
+def repair_profile(**kwargs):
+    kwargs.setdefault('title_mode', 'plain')
+    kwargs.setdefault('save_dir', 'xiuren')
+    kwargs.setdefault('metadata_dir', 'metadata')
+    kwargs.setdefault('retry_delay', 1)
+    kwargs.setdefault('max_concurrent_articles', 150)
+    return Profile('repair', listing_path='/XiuRen/', paginated=True, **kwargs)
+
+
+# 单章写真：直接下载指定的文章链接
+def single_profile(article_links, **kwargs):
+    kwargs.setdefault('title_mode', 'plain')
+    kwargs.setdefault('save_dir', 'photos')
+    kwargs.setdefault('metadata_dir', None)
+    kwargs.setdefault('max_retries', 3)
+    kwargs.setdefault('retry_delay', 2)
+    kwargs.setdefault('image_timeout', 10)
+    return Profile('single', article_links=article_links, **kwargs)
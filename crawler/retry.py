@@ -0,0 +1,123 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+import aiohttp
+
+from .storage import IncompleteDownloadError
+
+
+# 失败类型
+TIMEOUT = 'timeout'  # 请求超时
+SERVER_ERROR = 'server_error'  # 5xx
+NOT_FOUND = 'not_found'  # 404，不重试
+CLIENT_ERROR = 'client_error'  # 其他 4xx
+NETWORK = 'network'  # 连接断开等网络错误
+INCOMPLETE = 'incomplete'  # 响应体不完整
+DECODE = 'decode'  # 图片解码/保存失败
+
+# 说明主机过载的失败类型，自适应并发据此减小上限（另外 429 也视为过载）
+OVERLOAD_KINDS = (TIMEOUT, SERVER_ERROR, NETWORK)
+# 与主机状态无关的失败类型，不计入自适应并发
+LOCAL_KINDS = (INCOMPLETE, DECODE)
+
+# 各失败类型的最大尝试次数，None 表示使用 RetryPolicy.max_attempts
+DEFAULT_ATTEMPTS_BY_KIND = {
+    TIMEOUT: None,
+    SERVER_ERROR: None,
+    NETWORK: None,
+    INCOMPLETE: None,
+    NOT_FOUND: 1,
+    CLIENT_ERROR: 2,
+    DECODE: 2,
+}
+
+
+# 根据 HTTP 状态码判断失败类型
+def classify_status(status):
+    if status == 404:
+        return NOT_FOUND
+    if status >= 500:
+        return SERVER_ERROR
+    return CLIENT_ERROR
+
+
+# 根据异常判断失败类型
+def classify_exception(e):
+    if isinstance(e, asyncio.TimeoutError):
+        return TIMEOUT
+    if isinstance(e, aiohttp.ClientResponseError):
+        return classify_status(e.status)
+    if isinstance(e, aiohttp.ClientError):
+        return NETWORK
+    if isinstance(e, IncompleteDownloadError):
+        return INCOMPLETE
+    return DECODE  # 其余异常来自图片解码/保存
+
+
+class RetryPolicy:
+    """指数退避 + 全抖动（full jitter），按失败类型限制尝试次数。"""
+
+    def __init__(self, max_attempts=10, base_delay=1, max_delay=60, attempts_by_kind=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempts_by_kind = dict(DEFAULT_ATTEMPTS_BY_KIND, **(attempts_by_kind or {}))
+
+    # attempt 为已经尝试的次数（从 1 开始）
+    def should_retry(self, kind, attempt):
+        limit = self.attempts_by_kind.get(kind) or self.max_attempts
+        return attempt < min(limit, self.max_attempts)
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class RetryBudget:
+    """重试预算：每次请求存入 ratio 个令牌，每次重试消耗 1 个。
+
+    全局预算防止大面积故障时重试放大流量；文章级预算防止单篇文章的坏链接耗尽时间。
+    """
+
+    def __init__(self, ratio=0.2, initial=100):
+        self.ratio = ratio
+        self.tokens = initial
+
+    def deposit(self):
+        self.tokens += self.ratio
+
+    def spend(self):
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class CircuitBreaker:
+    """按主机统计最近请求的错误率，超过阈值时暂停该主机的请求一段时间。"""
+
+    def __init__(self, window=50, min_requests=20, error_rate=0.5, cooldown=30):
+        self.window = window
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.outcomes = {}  # 主机 -> 最近的请求结果（True 为成功）
+        self.open_until = {}  # 主机 -> 恢复时间
+
+    # 熔断期间等待恢复
+    async def wait(self, host):
+        remaining = self.open_until.get(host, 0) - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    def record(self, host, ok):
+        outcomes = self.outcomes.setdefault(host, deque(maxlen=self.window))
+        outcomes.append(ok)
+        if len(outcomes) < self.min_requests or time.monotonic() < self.open_until.get(host, 0):
+            return
+        errors = outcomes.count(False)
+        if errors / len(outcomes) >= self.error_rate:
+            print(f"{host} 错误率 {errors}/{len(outcomes)} 过高，暂停请求 {self.cooldown} 秒", flush=True)
+            self.open_until[host] = time.monotonic() + self.cooldown
+            outcomes.clear()
@@ -0,0 +1,96 @@
+import asyncio
+import itertools
+from collections import deque
+
+
+class Batch:
+    """一篇文章提交的一批图片：jobs 为还未开始下载的图片，remaining 为还未完成（含下载中）的图片数。"""
+
+    def __init__(self, order):
+        self.order = order  # 剩余数相同时按提交顺序
+        self.jobs = deque()
+        self.remaining = 0
+
+
+class DownloadScheduler:
+    """全局图片下载调度器。
+
+    与文章级并发分开，max_in_flight 限制的是已分派的图片任务数，不是网络请求数：任务分派给 worker 后，
+    还要在 HostLimiter 中排队等待主机并发名额（单主机的并发和速率由其自适应控制），失败时在重试退避中等待。
+    worker 分派任务时选择剩余图片最少的文章，剩余数随下载完成实时减少，快完成的文章优先分派；
+    已分派、正在等待名额的任务不会被后来的文章抢先，所以 max_in_flight 不宜远大于单主机并发上限。
+    """
+
+    def __init__(self, download, max_in_flight=64):
+        self.download = download  # 下载协程：download(img_url, *args) -> 结果
+        self.max_in_flight = max_in_flight
+        self.batches = []  # 还有图片未开始下载的文章
+        self.pending = asyncio.Semaphore(0)  # 未开始下载的图片数
+        self.workers = []
+        self.counter = itertools.count()
+
+    # 启动固定数量的 worker，worker 数即全局在途上限
+    def start(self):
+        if not self.workers:
+            self.workers = [asyncio.create_task(self._worker()) for _ in range(self.max_in_flight)]
+
+    async def close(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    # 等待下载的图片数
+    def qsize(self):
+        return sum(len(batch.jobs) for batch in self.batches)
+
+    # 取出剩余图片最少的文章的下一张图片
+    def _next(self):
+        batch = min(self.batches, key=lambda batch: (batch.remaining, batch.order))
+        job, future = batch.jobs.popleft()
+        if not batch.jobs:
+            self.batches.remove(batch)
+        return batch, job, future
+
+    async def _worker(self):
+        while True:
+            await self.pending.acquire()
+            batch, job, future = self._next()
+            try:
+                if future.cancelled():
+                    continue
+                result = await self.download(*job)
+                if not future.cancelled():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                batch.remaining -= 1
+
+    def _submit_batch(self, jobs):
+        self.start()
+        loop = asyncio.get_running_loop()
+        batch = Batch(next(self.counter))
+        futures = []
+        for job in jobs:
+            future = loop.create_future()
+            batch.jobs.append((job, future))
+            futures.append(future)
+        batch.remaining = len(jobs)
+        if jobs:
+            self.batches.append(batch)
+            for _ in jobs:
+                self.pending.release()
+        return futures
+
+    # 提交一张图片，job 为 download 的参数元组（第一个是图片地址）；单张图片的文章剩余数为 1，最先下载
+    def submit(self, job):
+        return self._submit_batch([job])[0]
+
+    # 提交一篇文章的一批图片，按提交顺序返回结果（异常作为结果返回）
+    async def download_all(self, jobs):
+        futures = self._submit_batch(jobs)
+        return await asyncio.gather(*futures, return_exceptions=True)
@@ -0,0 +1,20 @@
+import aiohttp
+
+
+# 连接池配置（所有入口共用）
+POOL_LIMIT = 200  # 连接池总连接数
+POOL_LIMIT_PER_HOST = 100  # 单个主机最大连接数
+DNS_CACHE_TTL = 300  # DNS 缓存时间（秒）
+KEEPALIVE_TIMEOUT = 60  # 空闲连接保持时间（秒）
+
+
+# 创建调优过的 aiohttp 会话：keep-alive、单主机连接上限、DNS 缓存
+def create_session(limit=POOL_LIMIT, limit_per_host=POOL_LIMIT_PER_HOST):
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(connector=connector)
@@ -0,0 +1,151 @@
+import sqlite3
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    source TEXT NOT NULL,
+    article_url TEXT NOT NULL,
+    title TEXT,
+    tag TEXT,
+    save_dir TEXT,
+    metadata_path TEXT,
+    poster_url TEXT,
+    max_pages INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    updated_at REAL,
+    PRIMARY KEY (source, article_url)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_status ON articles (source, status);
+
+CREATE TABLE IF NOT EXISTS images (
+    source TEXT NOT NULL,
+    article_url TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    filename TEXT,
+    format TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    PRIMARY KEY (source, article_url, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_images_status ON images (source, article_url, status);
+
+CREATE TABLE IF NOT EXISTS manifests (
+    article_url TEXT PRIMARY KEY,
+    max_pages INTEGER NOT NULL,
+    image_urls TEXT NOT NULL,
+    updated_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    source TEXT PRIMARY KEY,
+    article_id INTEGER NOT NULL,
+    updated_at REAL
+);
+"""
+
+# 文章状态
+PENDING = 'pending'  # 已发现，图片列表未完整记录
+INCOMPLETE = 'incomplete'  # 图片列表已记录，仍有失败的图片
+COMPLETE = 'complete'  # 所有图片下载成功
+
+
+class CrawlState:
+    """SQLite 抓取状态：文章、图片地址及下载状态，抓取过程中持续更新。
+
+    重启时已完成的文章不再发送任何请求，未完成的文章直接从记录的图片列表继续，
+    只下载未成功的图片。不同来源（Profile.name）的保存布局不同，记录按来源区分。
+    """
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def get_article(self, article_url):
+        return self.conn.execute('SELECT * FROM articles WHERE source = ? AND article_url = ?',
+                                 (self.source, article_url)).fetchone()
+
+    def is_complete(self, article_url):
+        row = self.conn.execute('SELECT status FROM articles WHERE source = ? AND article_url = ?',
+                                (self.source, article_url)).fetchone()
+        return row is not None and row['status'] == COMPLETE
+
+    # 记录文章信息和完整的图片列表（图片 idx 从 1 开始，与文件名一致）
+    def save_article(self, article_url, article, image_urls):
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO articles (source, article_url, title, tag, save_dir, metadata_path, poster_url, max_pages, status, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(source, article_url) DO UPDATE SET title=excluded.title, tag=excluded.tag, '
+                'save_dir=excluded.save_dir, metadata_path=excluded.metadata_path, poster_url=excluded.poster_url, '
+                'max_pages=excluded.max_pages, status=excluded.status, updated_at=excluded.updated_at',
+                (self.source, article_url, article['title'], article['tag_text'], article['save_dir'],
+                 article['metadata_path'], article['poster_url'], article['max_pages'], INCOMPLETE, time.time()))
+            self.conn.execute('DELETE FROM images WHERE source = ? AND article_url = ? AND idx > ?',
+                              (self.source, article_url, len(image_urls)))
+            self.conn.executemany(
+                'INSERT INTO images (source, article_url, idx, url) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(source, article_url, idx) DO UPDATE SET url=excluded.url, '
+                'status=CASE WHEN images.url = excluded.url THEN images.status ELSE \'pending\' END',
+                [(self.source, article_url, idx + 1, url) for idx, url in enumerate(image_urls)])
+
+    # 按序返回图片记录
+    def get_images(self, article_url):
+        return self.conn.execute('SELECT * FROM images WHERE source = ? AND article_url = ? ORDER BY idx',
+                                 (self.source, article_url)).fetchall()
+
+    # 批量更新图片状态：entries 为 (idx, metadata 条目)
+    def update_images(self, article_url, entries):
+        with self.conn:
+            self.conn.executemany(
+                'UPDATE images SET filename = ?, format = ?, status = ?, error = ? '
+                'WHERE source = ? AND article_url = ? AND idx = ?',
+                [(entry['filename'], entry.get('format'), entry['status'], entry.get('error'), self.source, article_url, idx)
+                 for idx, entry in entries])
+
+    def set_article_status(self, article_url, status):
+        with self.conn:
+            self.conn.execute('UPDATE articles SET status = ?, updated_at = ? WHERE source = ? AND article_url = ?',
+                              (status, time.time(), self.source, article_url))
+
+    # 文章图片清单（按顺序的图片地址和分页数），与来源无关，重新运行、修复和补下载时复用
+    def get_manifest(self, article_url):
+        row = self.conn.execute('SELECT max_pages, image_urls FROM manifests WHERE article_url = ?',
+                                (article_url,)).fetchone()
+        if row is None:
+            return None
+        return {'max_pages': row['max_pages'], 'image_urls': row['image_urls'].split('\n')}
+
+    def save_manifest(self, article_url, max_pages, image_urls):
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO manifests (article_url, max_pages, image_urls, updated_at) VALUES (?, ?, ?, ?)',
+                (article_url, max_pages, '\n'.join(image_urls), time.time()))
+
+    # 增量模式水位：该来源上次完整运行见到的最新文章 ID
+    def get_watermark(self):
+        row = self.conn.execute('SELECT article_id FROM watermarks WHERE source = ?', (self.source,)).fetchone()
+        return row['article_id'] if row else None
+
+    def set_watermark(self, article_id):
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO watermarks (source, article_id, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(source) DO UPDATE SET article_id=excluded.article_id, updated_at=excluded.updated_at',
+                (self.source, article_id, time.time()))
+
+    # 统计各状态的文章数
+    def summary(self):
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM articles WHERE source = ? GROUP BY status',
+                                      (self.source,)).fetchall())
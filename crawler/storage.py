@@ -0,0 +1,108 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+
+# 图片格式 -> 文件扩展名
+IMAGE_EXTENSIONS = {
+    'jpeg': '.jpg',
+    'png': '.png',
+    'webp': '.webp',
+    'gif': '.gif',
+}
+EXTENSION_FORMATS = {ext: fmt for fmt, ext in IMAGE_EXTENSIONS.items()}
+EXTENSION_FORMATS['.jpeg'] = 'jpeg'
+
+
+# 根据文件头判断图片格式，无法识别时返回 None
+def sniff_format(content):
+    if content[:3] == b'\xff\xd8\xff':
+        return 'jpeg'
+    if content[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'png'
+    if content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+        return 'webp'
+    if content[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    return None
+
+
+# 下载中的临时文件后缀，不会被当成已下载的图片
+PART_SUFFIX = '.part'
+TMP_SUFFIX = '.tmp'
+
+
+class IncompleteDownloadError(Exception):
+    """实际接收的字节数与 Content-Length 不一致。"""
+
+
+# 将图片转换为 JPG，先写临时文件再原子重命名，中途崩溃不会留下截断的 JPG
+# source 可以是文件路径或文件对象
+def transcode_to_jpeg(source, save_path):
+    tmp_path = save_path + TMP_SUFFIX
+    try:
+        with Image.open(source) as img:
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img.save(tmp_path, 'JPEG')
+        os.replace(tmp_path, save_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# 保存已完整下载到 part_path 的图片，save_stem 为不带扩展名的路径（如 photos/xxx/1）
+# mode='jpeg': 非 JPG 图片转换为 JPG，已是 JPG 的直接重命名，不重新编码
+# mode='raw': 按实际格式原样保存，不重新编码
+# 返回 (文件名, 原始格式)
+def store_image(part_path, save_stem, mode='jpeg'):
+    try:
+        with open(part_path, 'rb') as f:
+            fmt = sniff_format(f.read(16))
+        if fmt == 'jpeg' or (mode == 'raw' and fmt):
+            save_path = save_stem + IMAGE_EXTENSIONS[fmt]
+            os.replace(part_path, save_path)
+        else:
+            save_path = save_stem + '.jpg'
+            transcode_to_jpeg(part_path, save_path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+    return os.path.basename(save_path), fmt or 'unknown'
+
+
+# 列出目录中已有的图片：{序号文件名（不含扩展名）: 文件名}
+def list_existing_images(save_dir):
+    existing = {}
+    if not os.path.isdir(save_dir):
+        return existing
+    for file in os.listdir(save_dir):
+        stem, ext = os.path.splitext(file)
+        if ext.lower() in EXTENSION_FORMATS:
+            existing[stem] = file
+    return existing
+
+
+# 判断文件是否为图片（按扩展名）
+def is_image_file(filename):
+    return os.path.splitext(filename)[1].lower() in EXTENSION_FORMATS
+
+
+# 把一张非 JPG 图片转换为 JPG 并删除原文件
+def convert_file(src):
+    transcode_to_jpeg(src, os.path.splitext(src)[0] + '.jpg')
+    os.remove(src)
+
+
+# 延后转换：用进程池把 raw 模式保存的非 JPG 图片转换为 JPG，返回转换数量
+def convert_raw_images(root, workers=None):
+    sources = [
+        os.path.join(dirpath, file)
+        for dirpath, _, files in os.walk(root)
+        for file in files
+        if EXTENSION_FORMATS.get(os.path.splitext(file)[1].lower(), 'jpeg') != 'jpeg'
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(convert_file, sources, chunksize=16))
+    return len(sources)
@@ -0,0 +1,38 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .storage import store_image
+
+
+class Transcoder:
+    """把解码/编码从事件循环移到线程池或进程池。
+
+    mode: 'thread'（Pillow 编解码时会释放 GIL）、'process' 或 'inline'（在事件循环中直接执行）。
+    queue_size 限制已下载、等待转换的图片数量，网络阶段在队列满时等待。
+    storage_mode 见 storage.store_image。
+    """
+
+    def __init__(self, mode='thread', workers=None, queue_size=32, storage_mode='jpeg'):
+        self.mode = mode
+        self.storage_mode = storage_mode
+        self.workers = workers or os.cpu_count() or 4
+        self.slots = asyncio.Semaphore(queue_size)
+        if mode == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        elif mode == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='transcode')
+        else:
+            self.executor = None
+
+    # 保存已下载到临时文件的图片，返回 (文件名, 原始格式)
+    async def transcode(self, part_path, save_stem):
+        async with self.slots:
+            if self.executor is None:
+                return store_image(part_path, save_stem, self.storage_mode)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, store_image, part_path, save_stem, self.storage_mode)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
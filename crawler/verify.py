@@ -0,0 +1,110 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from .storage import EXTENSION_FORMATS, list_existing_images
+
+
+# 问题类型
+MISSING = 'missing'  # metadata 中有记录，文件不存在
+FAILED = 'failed'  # metadata 中记录为下载失败
+CORRUPT = 'corrupt'  # 文件无法解码
+TRUNCATED = 'truncated'  # JPG 缺少结束标记
+
+
+# 校验单张图片，放在模块顶层以便进程池调用；返回 (路径, 问题类型, 说明)，正常时问题类型为 None
+def verify_image(path, full_decode=False):
+    try:
+        with Image.open(path) as img:
+            if full_decode:
+                img.load()  # 完整解码，能发现数据损坏
+            else:
+                img.verify()  # 只检查文件头和结构
+        if EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower()) == 'jpeg':
+            with open(path, 'rb') as f:
+                f.seek(max(0, os.path.getsize(path) - 64))
+                if b'\xff\xd9' not in f.read():
+                    return path, TRUNCATED, '缺少 JPG 结束标记'
+    except Exception as e:
+        return path, CORRUPT, str(e)
+    return path, None, None
+
+
+# 查找本地的图片目录和 metadata 目录：photos/、xiuren/ 对应 metadata/，<tag>/ 对应 <tag>_metadata/
+def discover_layouts(base='.'):
+    layouts = []
+    for name in sorted(os.listdir(base)):
+        if name.endswith('_metadata') and os.path.isdir(os.path.join(base, name[:-len('_metadata')])):
+            layouts.append((os.path.join(base, name[:-len('_metadata')]), os.path.join(base, name)))
+    for name in ('photos', 'xiuren'):
+        if os.path.isdir(os.path.join(base, name)):
+            layouts.append((os.path.join(base, name), os.path.join(base, 'metadata')))
+    return layouts
+
+
+def load_metadata(metadata_path):
+    if not os.path.exists(metadata_path):
+        return None
+    with open(metadata_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class LibraryVerifier:
+    """离线校验图片库：多进程解码每张图片，并与 metadata JSON 对照，输出有问题的文件清单。"""
+
+    def __init__(self, layouts=None, full_decode=False, workers=None):
+        self.layouts = layouts if layouts is not None else discover_layouts()
+        self.full_decode = full_decode
+        self.workers = workers
+
+    # 返回问题列表，每项包含 path、article_dir、stem、url、metadata_path、reason、detail
+    def verify(self):
+        problems = []
+        files = {}  # 图片路径 -> (文章目录, 序号, 图片地址, metadata 路径)
+        for images_root, metadata_dir in self.layouts:
+            for article_title in sorted(os.listdir(images_root)):
+                article_dir = os.path.join(images_root, article_title)
+                if not os.path.isdir(article_dir):
+                    continue
+                existing = list_existing_images(article_dir)
+                metadata_path = os.path.join(metadata_dir, f"{article_title}.json")
+                metadata = load_metadata(metadata_path)
+                if metadata is None:
+                    metadata_path = None
+                urls = {}
+                if metadata:
+                    for entry in metadata.get('images', []):
+                        stem = os.path.splitext(entry['filename'])[0]
+                        urls[stem] = entry.get('url')
+                        if stem in existing:
+                            continue
+                        reason = FAILED if entry.get('status') == 'failed' else MISSING
+                        problems.append(self._problem(os.path.join(article_dir, entry['filename']), article_dir, stem,
+                                                      entry.get('url'), metadata_path, reason, entry.get('error')))
+                for stem, filename in existing.items():
+                    files[os.path.join(article_dir, filename)] = (article_dir, stem, urls.get(stem), metadata_path)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(verify_image, list(files), [self.full_decode] * len(files), chunksize=32)
+            for path, reason, detail in results:
+                if reason:
+                    problems.append(self._problem(path, *files[path], reason, detail))
+        print(f"校验 {len(files)} 张图片，发现 {len(problems)} 个问题")
+        return problems
+
+    @staticmethod
+    def _problem(path, article_dir, stem, url, metadata_path, reason, detail):
+        return {'path': path, 'article_dir': article_dir, 'stem': stem, 'url': url,
+                'metadata_path': metadata_path, 'reason': reason, 'detail': detail}
+
+
+def save_report(problems, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(problems, f, ensure_ascii=False, indent=4)
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,42 @@
+import asyncio
+import sys
+
+from crawler import ShardWorker, category_profile, coordinate
+
+
+BASE_URL = "http://25.xy02.my"
+CATEGORIES = ["MiiTao", "FeiLin", "MFStar", "MyGirl", "IMiss"]  # 要切分的分类
+QUEUE_PATH = "work_queue.db"  # 工作队列，多台机器共用时放在共享存储上
+UNIT_PAGES = 10  # 每个工作单元包含的列表页数
+LEASE_SECONDS = 300  # 租约时长（秒），worker 失联超过该时间后单元会被重新分配
+POLL_INTERVAL = 30  # 暂无可领取单元时的等待间隔（秒）
+MAX_ATTEMPTS = 5  # 单元最多领取次数，达到后标记为 failed 不再分配
+UNIT_RETRY_DELAY = 60  # 单元失败后再次领取前的等待时间（秒），按失败次数指数增加
+# 全局配置
+MAX_RETRIES = 10  # 最大重试次数
+RETRY_DELAY = 1  # 重试退避基础时间（秒），按指数退避并加随机抖动
+MAX_CONCURRENT_DOWNLOADS = 100  # 同时处理的文章数，只限制流水线宽度；请求并发由单主机 AIMD 限流自适应控制
+MAX_IN_FLIGHT_IMAGES = 64  # 全局同时分派的图片任务数，实际请求数还受单主机并发限制
+MAX_IMAGES_PER_HOST = 32  # 单主机同时在途的请求数上限，实际并发按响应时间和错误率自适应调整（AIMD）
+HOST_RATE = 50  # 单主机每秒请求数上限，None 表示不限
+
+
+def make_profile(listing_url):
+    return category_profile(listing_url, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY,
+                            max_concurrent_articles=MAX_CONCURRENT_DOWNLOADS,
+                            max_in_flight_images=MAX_IN_FLIGHT_IMAGES, max_images_per_host=MAX_IMAGES_PER_HOST,
+                            host_rate=HOST_RATE)
+
+
+if __name__ == "__main__":
+    # 用法：python 分布式抓取.py coordinator [起始页] [结束页]   切分列表页范围（不指定结束页时读取分页总数）
+    #       python 分布式抓取.py worker                        在每台机器上启动一个或多个 worker
+    role = sys.argv[1] if len(sys.argv) > 1 else "worker"
+    if role == "coordinator":
+        start_page = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        end_page = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        profiles = [make_profile(f"{BASE_URL}/{category}/") for category in CATEGORIES]
+        asyncio.run(coordinate(QUEUE_PATH, profiles, start_page, end_page, UNIT_PAGES))
+    else:
+        asyncio.run(ShardWorker(QUEUE_PATH, make_profile, lease_seconds=LEASE_SECONDS, poll_interval=POLL_INTERVAL,
+                                max_attempts=MAX_ATTEMPTS, retry_delay=UNIT_RETRY_DELAY).run())
@@ -1,10 +1,327 @@
 from telethon import TelegramClient
+from telethon.errors import FileReferenceExpiredError, FloodWaitError
 from telethon.sessions import StringSession
+from telethon.tl.types import InputDocument, InputPhoto
+import hashlib
 import os
-import shutil
+import sqlite3
+import struct
+import time
 import asyncio  # 引入 asyncio 模块以使用 sleep
 import socks
-import random
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+# 下载时 raw 模式会按原始格式保存，这些扩展名都视为图片
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+# Telegram 只把 JPG/PNG 作为图片发送，其他格式是文档，不能和图片放在同一个相册里
+PHOTO_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+PREFETCH_DEPTH = 3  # 提前打包好、等待上传的套数上限
+ARCHIVE_WORKERS = 2  # 计算哈希和 CRC 的进程数，在独立进程中进行，不阻塞上传
+ZIP_VOLUME_SIZE = 2000 * 1024 * 1024  # zip 分卷大小上限，Telegram 单个文档最大 2 GB，超过时自动分卷
+QUEUE_PATH = 'send_queue.db'  # 发送队列和限速状态，重启后从上次确认发送的消息继续
+INITIAL_INTERVAL = 270  # 两套之间的初始间隔（秒），原先每 10 套等待 40~50 分钟，约合每套 270 秒
+MIN_INTERVAL = 30  # 间隔下限（秒）
+MAX_INTERVAL = 3600  # 间隔上限（秒）
+FLOOD_BACKOFF = 1.5  # 遇到 FloodWait 后间隔放大的倍数
+SPEEDUP = 0.95  # 连续成功 SPEEDUP_AFTER 套后间隔缩小的倍数
+SPEEDUP_AFTER = 10
+FLOOD_SPREAD = 10  # 间隔至少为 FloodWait 要求的等待时间除以该值，即把一次限流的等待分摊到之后的若干套
+ALBUM_SIZE = 10  # Telegram 相册最多 10 个文件
+UPLOAD_CONCURRENCY = 4  # 同时预上传的文件数
+
+
+# 按数字顺序列出目录中的图片，0 为海报
+def collect_images(image_dir):
+    return sorted(
+        [os.path.join(image_dir, file) for file in os.listdir(image_dir) if file.lower().endswith(IMAGE_EXTENSIONS)],
+        key=lambda x: int(os.path.splitext(os.path.basename(x))[0])  # 按数字排序
+    )
+
+
+# 一次读取同时计算内容哈希和 CRC32（在进程池中执行），哈希用于查找已上传过的媒体，CRC 用于生成 zip 文件头
+def digest_file(path):
+    digest = hashlib.sha256()
+    crc = 0
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+    return digest.hexdigest(), crc, stat.st_size, stat.st_mtime
+
+
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+END_RECORD = struct.Struct('<IHHHHIIH')
+
+
+# zip 使用 DOS 时间，最早为 1980 年
+def dos_time(mtime):
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+class ZipVolume:
+    """不压缩（stored）的 zip：JPG 已经压缩过，再用 DEFLATE 压缩只浪费 CPU。
+
+    各文件的 CRC 预先在进程池中并行算好，文件头和 zip 总大小都能提前确定，
+    上传时按顺序输出文件头和文件内容，不在磁盘上生成 zip。entries 为 (路径, 大小, CRC, 修改时间)。
+    """
+
+    def __init__(self, name, entries, hashes):
+        self.name = name
+        self.segments = []  # 按顺序输出的内容：bytes 为文件头，(路径, 大小) 为文件内容
+        central = []
+        offset = 0
+        for path, size, crc, mtime in entries:
+            arcname = os.path.basename(path).encode('utf-8')
+            flags = 0 if arcname.isascii() else 0x800  # 非 ASCII 文件名标记为 UTF-8
+            dtime, ddate = dos_time(mtime)
+            header = LOCAL_HEADER.pack(0x04034b50, 20, flags, 0, dtime, ddate, crc, size, size, len(arcname), 0)
+            central.append(CENTRAL_HEADER.pack(0x02014b50, 20, 20, flags, 0, dtime, ddate, crc, size, size,
+                                               len(arcname), 0, 0, 0, 0, 0, offset) + arcname)
+            self.segments += [header + arcname, (path, size)]
+            offset += len(header) + len(arcname) + size
+        directory = b''.join(central)
+        self.segments.append(directory + END_RECORD.pack(0x06054b50, 0, 0, len(entries), len(entries),
+                                                         len(directory), offset, 0))
+        self.size = offset + len(self.segments[-1])
+        # 目录记录了每个文件的名称、大小、CRC 和位置，再加上各文件的内容哈希，就确定了整个 zip 的内容
+        digest = hashlib.sha256(directory)
+        for path, *_ in entries:
+            digest.update(hashes[path].encode())
+        self.sha256 = digest.hexdigest()
+
+    def iter_bytes(self):
+        for segment in self.segments:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+            path, size = segment
+            read = 0
+            with open(path, 'rb') as f:
+                while chunk := f.read(1024 * 1024):
+                    read += len(chunk)
+                    yield chunk
+            if read != size:
+                raise ValueError(f'文件在打包后被修改：{path}')
+
+    def open(self):
+        return ZipStream(self)
+
+
+class ZipStream:
+    """按顺序读取 ZipVolume 的内容，供 upload_file 分块上传；除最后一块外每次都返回完整的 n 字节。"""
+
+    def __init__(self, volume):
+        self.name = volume.name
+        self.chunks = volume.iter_bytes()
+        self.buffer = bytearray()
+
+    def read(self, n=-1):
+        while n < 0 or len(self.buffer) < n:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        if n < 0:
+            n = len(self.buffer)
+        data = bytes(self.buffer[:n])
+        del self.buffer[:n]
+        return data
+
+    def close(self):
+        self.chunks.close()
+
+
+# 按 ZIP_VOLUME_SIZE 把文件分到多个 zip，每个分卷都是完整的 zip，可以单独解压
+def plan_volumes(name, entries, hashes):
+    volumes, current, total = [], [], END_RECORD.size
+    for entry in entries:
+        size = LOCAL_HEADER.size + CENTRAL_HEADER.size + 2 * len(os.path.basename(entry[0]).encode('utf-8')) + entry[1]
+        if size + END_RECORD.size > ZIP_VOLUME_SIZE:
+            raise ValueError(f'文件超过分卷大小：{entry[0]}')
+        if current and total + size > ZIP_VOLUME_SIZE:
+            volumes.append(current)
+            current, total = [], END_RECORD.size
+        current.append(entry)
+        total += size
+    volumes.append(current)
+    if len(volumes) == 1:
+        return [ZipVolume(f'{name}.zip', volumes[0], hashes)]
+    return [ZipVolume(f'{name}.part{number}.zip', volume, hashes) for number, volume in enumerate(volumes, 1)]
+
+
+class SendQueue:
+    """持久化的发送队列：按频道记录每套写真的相册和 zip 是否已确认发送，以及学习到的发送间隔。
+
+    发送进度按 (频道, 目录) 记录，换一个频道时所有写真会重新发送（已上传的媒体由 MediaLedger 直接引用）。
+    """
+
+    def __init__(self, path, channel):
+        self.channel = channel
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sets (
+                channel TEXT NOT NULL,
+                dir TEXT NOT NULL,
+                album_sent INTEGER NOT NULL DEFAULT 0,
+                album_chunks INTEGER NOT NULL DEFAULT 0,
+                zip_sent INTEGER NOT NULL DEFAULT 0,
+                sent_at REAL,
+                PRIMARY KEY (channel, dir)
+            );
+            CREATE TABLE IF NOT EXISTS pacing (
+                key TEXT PRIMARY KEY,
+                value REAL NOT NULL
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    # 加入新出现的目录，返回未发送完成的目录（按名称排序）
+    def sync(self, dirs):
+        with self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO sets (channel, dir) VALUES (?, ?)',
+                                  [(self.channel, d) for d in dirs])
+        sent = {row['dir'] for row in self.conn.execute('SELECT dir FROM sets WHERE channel = ? AND zip_sent = 1',
+                                                        (self.channel,))}
+        return [d for d in sorted(dirs) if d not in sent]
+
+    def get(self, dir):
+        return self.conn.execute('SELECT * FROM sets WHERE channel = ? AND dir = ?', (self.channel, dir)).fetchone()
+
+    def mark(self, dir, step):
+        with self.conn:
+            self.conn.execute(f'UPDATE sets SET {step} = 1, sent_at = ? WHERE channel = ? AND dir = ?',
+                              (time.time(), self.channel, dir))
+
+    # 记录相册已确认发送的分组数，重启时从下一组继续
+    def mark_chunks(self, dir, chunks):
+        with self.conn:
+            self.conn.execute('UPDATE sets SET album_chunks = ?, sent_at = ? WHERE channel = ? AND dir = ?',
+                              (chunks, time.time(), self.channel, dir))
+
+    def get_value(self, key, default):
+        row = self.conn.execute('SELECT value FROM pacing WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else default
+
+    def set_value(self, key, value):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO pacing (key, value) VALUES (?, ?)', (key, value))
+
+
+class MediaLedger:
+    """已上传媒体记录：按文件内容哈希保存 Telegram 返回的媒体引用（id、access_hash、file_reference）。
+
+    再次发送相同内容（发到其他频道、部分失败后重发）时直接引用已有媒体，不再上传文件；
+    同一文件作为图片和作为文档发送时是不同的媒体，分别记录。引用过期时删除记录，重新上传。
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS media (
+                sha256 TEXT NOT NULL,
+                as_document INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                media_id INTEGER NOT NULL,
+                access_hash INTEGER NOT NULL,
+                file_reference BLOB NOT NULL,
+                uploaded_at REAL,
+                PRIMARY KEY (sha256, as_document)
+            )
+        """)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def lookup(self, sha256, as_document):
+        row = self.conn.execute('SELECT * FROM media WHERE sha256 = ? AND as_document = ?',
+                                (sha256, int(as_document))).fetchone()
+        if row is None:
+            return None
+        media_type = InputPhoto if row['kind'] == 'photo' else InputDocument
+        return media_type(id=row['media_id'], access_hash=row['access_hash'], file_reference=row['file_reference'])
+
+    # 把要发送的文件替换为已有的媒体引用，返回 (发送列表, 复用数量)
+    def resolve(self, paths, hashes, as_document):
+        files = []
+        for path in paths:
+            media = self.lookup(hashes[path], as_document)
+            files.append(media or path)
+        return files, sum(1 for file in files if isinstance(file, (InputPhoto, InputDocument)))
+
+    # 记录发送结果，messages 与 paths 一一对应
+    def record(self, paths, hashes, messages, as_document):
+        if not isinstance(messages, list):
+            messages = [messages]
+        rows = []
+        for path, message in zip(paths, messages):
+            media = message.photo or message.document
+            if media is None:
+                continue
+            kind = 'photo' if message.photo else 'document'
+            rows.append((hashes[path], int(as_document), kind, media.id, media.access_hash,
+                         media.file_reference, time.time()))
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def forget(self, paths, hashes, as_document):
+        with self.conn:
+            self.conn.executemany('DELETE FROM media WHERE sha256 = ? AND as_document = ?',
+                                  [(hashes[path], int(as_document)) for path in paths])
+
+
+class UploadPacer:
+    """根据 FloodWait 学习可持续的发送速度：每套之间等待 interval 秒。
+
+    遇到 FloodWait 时按服务器要求的秒数等待，并把间隔放大 FLOOD_BACKOFF 倍；
+    连续成功 SPEEDUP_AFTER 套后把间隔缩小一点，逐步逼近不触发限流的速度。学到的间隔保存在发送队列中。
+    并行上传的多个请求会遇到同一次限流：限流结束前收到的 FloodWait 只延长等待时间，不再放大间隔。
+    """
+
+    def __init__(self, send_queue):
+        self.send_queue = send_queue
+        self.interval = send_queue.get_value('interval', INITIAL_INTERVAL)
+        self.successes = 0
+        self.flood_until = 0  # 当前限流的结束时间（time.monotonic()）
+
+    # 记录一次 FloodWait，是新的一次限流时调整间隔并返回 True
+    def on_flood(self, seconds):
+        now = time.monotonic()
+        is_new = now >= self.flood_until
+        self.flood_until = max(self.flood_until, now + seconds + 1)
+        if is_new:
+            self.successes = 0
+            self.interval = min(MAX_INTERVAL, max(self.interval * FLOOD_BACKOFF, seconds / FLOOD_SPREAD))
+            self.send_queue.set_value('interval', self.interval)
+        return is_new
+
+    # 限流期间所有请求都等到限流结束再发送
+    async def wait_flood(self):
+        delay = self.flood_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        self.successes += 1
+        if self.successes >= SPEEDUP_AFTER:
+            self.successes = 0
+            self.interval = max(MIN_INTERVAL, self.interval * SPEEDUP)
+            self.send_queue.set_value('interval', self.interval)
+
+    async def wait(self):
+        print(f'等待 {self.interval:.0f} 秒后发送下一套...')
+        await asyncio.sleep(self.interval)
+
 
 class TelegramImageDownloader:
     def __init__(self, api_id, api_hash, channel, download_directory, proxy):
@@ -12,6 +329,10 @@ class TelegramImageDownloader:
         self.api_hash = api_hash
         self.channel = channel
         self.download_directory = download_directory
+        self.send_queue = SendQueue(QUEUE_PATH, channel)
+        self.pacer = UploadPacer(self.send_queue)
+        self.ledger = MediaLedger(QUEUE_PATH)
+        self.upload_slots = asyncio.Semaphore(UPLOAD_CONCURRENCY)
         # 创建 Telegram 客户端
         if not proxy:
             self.client = TelegramClient(StringSession(string_session), api_id, api_hash)
@@ -21,46 +342,126 @@ class TelegramImageDownloader:
     def get_subdirectories(self, directory):
         # 获取指定目录下的所有子目录
         subdirs = [d for d in os.listdir(directory) if os.path.isdir(os.path.join(directory, d))]
-        # print(subdirs)
-        subdirs = ['6622期就是阿朱啊写真,就是阿朱啊,就是阿朱啊套图', '7062期杨晨晨写真,杨晨晨,杨晨晨套图', '7382期杨晨晨写真,杨晨晨,杨晨晨套图', 'XiaoYu画语界第464期杨晨晨写真,杨晨晨,杨晨晨套图', '7010期幼幼写真,幼幼,幼幼套图', 'MyGirl美媛馆第443期言沫写真,言沫,言沫套图', 'YouMi尤蜜荟第599期朱可儿写真,朱可儿,朱可儿套图', '6204期是小逗逗写真,是小逗逗,是小逗逗套图', '6652期是小逗逗写真,是小逗逗,是小逗逗套图', '7225期周于希写真,周于希,周于希套图', '3010期鱼子酱写真,鱼子酱,鱼子酱套图', '6135期鱼子酱写真,鱼子酱,鱼子酱套图', '6689期王雨纯写真,王雨纯,王雨纯套图', '1967期王雨纯写真,王雨纯,王雨纯套图', '6530期是小逗逗写真,是小逗逗,是小逗逗套图', '6020期是小逗逗写真,是小逗逗,是小逗逗套图', '6773期鱼子酱写真,鱼子酱,鱼子酱套图']
-        return subdirs
+        # 只返回还没发送完成的目录，已确认发送的记录在发送队列中
+        return self.send_queue.sync(subdirs)
+
+    # 发送一次，遇到 FloodWait 时按要求的秒数等待后重试，而不是退出
+    async def send_with_flood_wait(self, **kwargs):
+        return await self.with_flood_wait(self.client.send_file, self.channel, **kwargs)
+
+    async def with_flood_wait(self, request, *args, **kwargs):
+        while True:
+            await self.pacer.wait_flood()
+            try:
+                return await request(*args, **kwargs)
+            except FloodWaitError as e:
+                if self.pacer.on_flood(e.seconds):
+                    print(f'触发限流，等待 {e.seconds} 秒，之后每套间隔 {self.pacer.interval:.0f} 秒')
+
+    # 后台按顺序打包各套写真：并行计算每张图片的哈希和 CRC，生成 zip 分卷，放入有界队列，最多领先上传 PREFETCH_DEPTH 套
+    async def prepare_archives(self, dirs, queue):
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=ARCHIVE_WORKERS) as executor:
+            for index, dir in enumerate(dirs):
+                image_dir = os.path.join(self.download_directory, dir)
+                try:
+                    image_paths = collect_images(image_dir)
+                    digests = await asyncio.gather(
+                        *[loop.run_in_executor(executor, digest_file, path) for path in image_paths])
+                    hashes = {path: sha256 for path, (sha256, *_) in zip(image_paths, digests)}
+                    volumes = plan_volumes(dir, [(path, size, crc, mtime) for path, (_, crc, size, mtime)
+                                                 in zip(image_paths, digests)], hashes)
+                    hashes.update({volume: volume.sha256 for volume in volumes})
+                except Exception as e:
+                    print(f'打包失败，跳过：{index} {dir} {e}')
+                    continue
+                await queue.put((index, dir, image_paths, volumes, hashes))
+        await queue.put(None)
+
     async def send_xiezhen(self, dirs):
-        for index, dir in enumerate(dirs):
-            dirname = os.path.basename(os.path.normpath(dir))
-            # 图片文件路径
-            image_dir = os.path.join(self.download_directory, dir)
-            image_path = f'{image_dir}/0.jpg'
-            image_paths = sorted(
-                [os.path.join(image_dir, file) for file in os.listdir(image_dir) if file.endswith('.jpg')],
-                key=lambda x: int(os.path.splitext(os.path.basename(x))[0])  # 按数字排序
-            )
-            zip_file_path = f'{image_dir}.zip'
-
-            # 压缩目录
-            if not os.path.exists(zip_file_path):
-                shutil.make_archive(f'{image_dir}', 'zip', f'{image_dir}')
-
-            print(f'当前发送：{index} {dirname}')
-            # 发送图片作为相册
-            await self.client.send_file(
-                self.channel,
-                file=image_paths,  # 发送多张图片
-                caption=f'{dirname}',  # 消息说明
-            )
+        queue = asyncio.Queue(maxsize=PREFETCH_DEPTH)
+        producer = asyncio.create_task(self.prepare_archives(dirs, queue))
+        try:
+            sent = 0
+            while (item := await queue.get()) is not None:
+                if sent:
+                    await self.pacer.wait()  # 按学习到的间隔发送下一套，等待期间后台继续打包
+                await self.send_one(*item)
+                sent += 1
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
 
-            # 发送 ZIP 文件作为文档
-            await self.client.send_file(
-                self.channel,
-                file=[image_path, zip_file_path],
-                caption=f'{dirname}',
-                force_document = True  # 强制将所有文件作为文档发送
-            )
+    # 预上传一个文件，返回上传句柄，发送时引用句柄不再传输文件内容
+    async def upload(self, file):
+        async with self.upload_slots:
+            return await self.with_flood_wait(self.upload_file, file)
+
+    # zip 分卷边生成边上传，每次重试都重新生成
+    async def upload_file(self, file):
+        if not isinstance(file, ZipVolume):
+            return await self.client.upload_file(file)
+        stream = file.open()
+        try:
+            return await self.client.upload_file(stream, file_size=file.size, file_name=file.name)
+        finally:
+            stream.close()
+
+    # 按 ALBUM_SIZE 分组发送文件，已上传过的内容直接引用；其余文件并行预上传，发送当前分组时后面的分组继续上传
+    # skip_chunks 为已确认发送的分组数，每发送一组调用 on_chunk(已发送的分组数)
+    async def send_media(self, paths, hashes, caption, as_document=False, skip_chunks=0, on_chunk=None):
+        chunks = [paths[start:start + ALBUM_SIZE] for start in range(0, len(paths), ALBUM_SIZE)][skip_chunks:]
+        pending = [path for chunk in chunks for path in chunk]
+        files, reused = self.ledger.resolve(pending, hashes, as_document)
+        if reused:
+            print(f'复用已上传的媒体 {reused}/{len(pending)} 个')
+        uploads = {path: asyncio.create_task(self.upload(path)) for path, file in zip(pending, files)
+                   if not isinstance(file, (InputPhoto, InputDocument))}
+        references = dict(zip(pending, files))
+        try:
+            for number, chunk in enumerate(chunks, skip_chunks + 1):
+                chunk_files = [await uploads[path] if path in uploads else references[path] for path in chunk]
+                try:
+                    messages = await self.send_with_flood_wait(file=chunk_files, caption=caption,
+                                                               force_document=as_document)
+                except FileReferenceExpiredError:
+                    print('媒体引用已过期，重新上传')
+                    self.ledger.forget(chunk, hashes, as_document)
+                    chunk_files = await asyncio.gather(*[self.upload(path) for path in chunk])
+                    messages = await self.send_with_flood_wait(file=list(chunk_files), caption=caption,
+                                                               force_document=as_document)
+                self.ledger.record(chunk, hashes, messages, as_document)
+                if on_chunk:
+                    on_chunk(number)
+        finally:
+            for task in uploads.values():
+                task.cancel()
+            await asyncio.gather(*uploads.values(), return_exceptions=True)
+
+    async def send_one(self, index, dir, image_paths, volumes, hashes):
+        dirname = os.path.basename(os.path.normpath(dir))
+        image_path = image_paths[0]  # 海报 0.jpg
+        photo_paths = [path for path in image_paths if path.lower().endswith(PHOTO_EXTENSIONS)]
+        # raw 模式保存的 WEBP/GIF 等和 zip 一起作为文档发送
+        document_paths = [image_path] + [path for path in image_paths
+                                         if path != image_path and not path.lower().endswith(PHOTO_EXTENSIONS)]
+
+        print(f'当前发送：{index} {dirname}')
+        record = self.send_queue.get(dir)
+        # 发送图片作为相册（重启时已确认发送的部分不再重复发送）
+        if not record['album_sent']:
+            # 发送多张图片，caption 为消息说明
+            await self.send_media(photo_paths, hashes, caption=f'{dirname}', skip_chunks=record['album_chunks'],
+                                  on_chunk=lambda chunks: self.send_queue.mark_chunks(dir, chunks))
+            self.send_queue.mark(dir, 'album_sent')
+
+        # 发送 ZIP 文件作为文档
+        if not record['zip_sent']:
+            # 强制将所有文件作为文档发送
+            await self.send_media([*document_paths, *volumes], hashes, caption=f'{dirname}', as_document=True)
+            self.send_queue.mark(dir, 'zip_sent')
 
-            # 每发送5套，等待x分钟
-            if (index + 1) % 10 == 0:
-                wait_time = random.randint(40, 50) * 60  # 随机等待时间 1 到 10 分钟（转换为秒）
-                print(f'已发送 {index + 1} 套，等待 {wait_time} 秒...')
-                await asyncio.sleep(wait_time)
+        self.pacer.on_success()
 
     def run(self):
         dirs = self.get_subdirectories(self.download_directory)
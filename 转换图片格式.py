@@ -0,0 +1,13 @@
+from crawler.storage import convert_raw_images
+
+# 需要转换的目录（raw 模式下载的写真）
+ROOT_DIRS = ["photos"]
+# 转换进程数，默认 CPU 核数
+WORKERS = None
+
+
+# 把 raw 模式保存的 WebP/PNG/GIF 统一转换为 JPG，在下载完成后离线执行
+if __name__ == "__main__":
+    for root in ROOT_DIRS:
+        converted = convert_raw_images(root, WORKERS)
+        print(f"{root}: 转换 {converted} 张图片为 JPG")